@@ -2,8 +2,9 @@ import streamlit as st
 
 from services.educational_chatbot.rag_service import (
     build_vectorstore_from_pdf,
-    ask_question_with_rag,
+    ask_question_with_rag_stream,
     get_context_text,
+    get_exam_context,
 )
 
 from services.educational_chatbot.citation_service import generate_citations
@@ -19,6 +20,14 @@ from services.educational_chatbot.memory_service import (
     ConversationMemoryService,
 )
 
+from services.educational_chatbot.course_library_service import (
+    get_course_library,
+    list_courses,
+)
+
+from services.core.llm_errors import LLMError
+from utils.ui_helpers import show_error_card
+
 
 
 # EDUCATIONAL CHATBOT UI
@@ -35,6 +44,10 @@ def render_educational_chatbot():
         st.session_state.vectorstore = None
         st.session_state.pdf_name = None
 
+    # course library: documents to restrict retrieval to (None = all)
+    if "doc_filter" not in st.session_state:
+        st.session_state.doc_filter = None
+
     if "chat_memory" not in st.session_state:
         st.session_state.chat_memory = ConversationMemoryService()
 
@@ -51,31 +64,108 @@ def render_educational_chatbot():
         st.session_state.practice_result = None
 
     
-    # PDF UPLOAD
-    
-    uploaded_pdf = st.file_uploader("Upload PDF", type=["pdf"])
-
-    if uploaded_pdf:
-        if (
-            st.session_state.vectorstore is None
-            or st.session_state.pdf_name != uploaded_pdf.name
-        ):
-            with st.spinner("Processing PDF..."):
-                st.session_state.vectorstore = build_vectorstore_from_pdf(uploaded_pdf)
-                st.session_state.pdf_name = uploaded_pdf.name
-
-                st.session_state.chat_history.clear()
-                st.session_state.chat_memory.clear()
-                st.session_state.practice_questions = []
-                st.session_state.practice_answers = {}
-                st.session_state.practice_result = None
+    # SOURCE: PDF UPLOAD OR PRE-LOADED COURSE LIBRARY
+
+    courses = list_courses()
+
+    source = "Upload PDF"
+    if courses:
+        source = st.radio(
+            "Source",
+            ["Upload PDF", "Course Library"],
+            horizontal=True,
+        )
+
+    def _reset_session():
+        st.session_state.chat_history.clear()
+        st.session_state.chat_memory.clear()
+        st.session_state.practice_questions = []
+        st.session_state.practice_answers = {}
+        st.session_state.practice_result = None
+
+    if source == "Course Library":
+        course = st.selectbox("Course", courses)
+
+        with st.spinner("Loading course library..."):
+            library = get_course_library(course)
+
+        names = library.document_names()
 
-            st.success("PDF indexed successfully.")
+        selected = st.multiselect(
+            "Documents",
+            options=list(names),
+            default=list(names),
+            format_func=names.get,
+        )
+
+        if st.session_state.pdf_name != f"course:{course}":
+            st.session_state.vectorstore = library.vectorstore
+            st.session_state.pdf_name = f"course:{course}"
+            _reset_session()
+
+        # all selected → unfiltered search
+        st.session_state.doc_filter = (
+            None if len(selected) == len(names) else selected
+        )
+
+    else:
+        st.session_state.doc_filter = None
+
+        # leaving the library → wait for an upload
+        if (st.session_state.pdf_name or "").startswith("course:"):
+            st.session_state.vectorstore = None
+            st.session_state.pdf_name = None
+            _reset_session()
+
+        uploaded_pdf = st.file_uploader("Upload PDF", type=["pdf"])
+
+        if uploaded_pdf:
+            if (
+                st.session_state.vectorstore is None
+                or st.session_state.pdf_name != uploaded_pdf.name
+            ):
+                with st.spinner("Processing PDF..."):
+                    st.session_state.vectorstore = build_vectorstore_from_pdf(
+                        uploaded_pdf,
+                        background=True,
+                    )
+                    st.session_state.pdf_name = uploaded_pdf.name
+
+                    _reset_session()
 
     if st.session_state.vectorstore is None:
         st.info("Upload a PDF to begin.")
         return
 
+    
+    # INDEXING PROGRESS
+    
+    status = st.session_state.vectorstore.ingest_status
+
+    if status.get("error"):
+        # forget the failed store so the same file is rebuilt next run
+        st.session_state.vectorstore = None
+        st.session_state.pdf_name = None
+
+        st.error("Failed to index the PDF. Please upload it again.")
+        return
+
+    if status["complete"]:
+        st.success("PDF indexed successfully.")
+    else:
+        total_pages = max(status["total_pages"], 1)
+
+        st.progress(
+            min(status["pages_done"] / total_pages, 1.0),
+            text=(
+                f"Indexing PDF... {status['pages_done']}/{status['total_pages']} "
+                "pages. You can already ask about the indexed pages."
+            ),
+        )
+
+        if st.button("🔄 Refresh progress"):
+            st.rerun()
+
     st.divider()
 
     
@@ -128,27 +218,34 @@ def render_educational_chatbot():
             # ASSISTANT RESPONSE
         
             with st.chat_message("assistant"):
-                with st.spinner("Thinking..."):
+                try:
+                    with st.spinner("Thinking..."):
 
-                    answer, docs = ask_question_with_rag(
-                        vectorstore=st.session_state.vectorstore,
-                        question=user_question,
-                        memory_text=st.session_state.chat_memory.get_context(),
-                    )
+                        answer_stream, docs = ask_question_with_rag_stream(
+                            vectorstore=st.session_state.vectorstore,
+                            question=user_question,
+                            memory_text=st.session_state.chat_memory.get_context(),
+                            doc_ids=st.session_state.doc_filter,
+                        )
+
+                    # tokens render as they arrive
+                    answer = st.write_stream(answer_stream)
 
-                    st.markdown(answer)
+                except LLMError as e:
+                    show_error_card(e.user_message)
+                    st.stop()
 
-                    citations = []
+                citations = []
 
-                    if not answer.lower().startswith(
-                        "i could not find this information"
-                    ):
-                        citations = generate_citations(docs)
+                if not answer.lower().startswith(
+                    "i could not find this information"
+                ):
+                    citations = generate_citations(docs)
 
-                        if citations:
-                            st.markdown("**📚 Sources:**")
-                            for c in citations:
-                                st.markdown(f"- {c}")
+                    if citations:
+                        st.markdown("**📚 Sources:**")
+                        for c in citations:
+                            st.markdown(f"- {c}")
 
             
             # SAVE MEMORY (hidden)
@@ -212,13 +309,18 @@ def render_educational_chatbot():
                     vectorstore=st.session_state.vectorstore,
                     query=retrieval_query,
                     top_k=8,
+                    doc_ids=st.session_state.doc_filter,
                 )
 
-                st.session_state.practice_questions = generate_questions_from_context(
-                    context=context,
-                    num_questions=num_q,
-                    difficulty=difficulty,
-                )
+                try:
+                    st.session_state.practice_questions = generate_questions_from_context(
+                        context=context,
+                        num_questions=num_q,
+                        difficulty=difficulty,
+                    )
+                except LLMError as e:
+                    show_error_card(e.user_message)
+                    st.stop()
 
                 st.session_state.practice_answers = {}
                 st.session_state.practice_result = None
@@ -249,18 +351,23 @@ def render_educational_chatbot():
                     for q in st.session_state.practice_questions
                 ]
 
-                reference_context = get_context_text(
+                reference_context = get_exam_context(
                     vectorstore=st.session_state.vectorstore,
-                    query="important concepts",
+                    questions=st.session_state.practice_questions,
                     top_k=10,
+                    doc_ids=st.session_state.doc_filter,
                 )
 
-                with st.spinner("Evaluating your answers..."):
-                    st.session_state.practice_result = evaluate_exam_answers(
-                        questions=st.session_state.practice_questions,
-                        student_answers=answers_list,
-                        reference_context=reference_context,
-                    )
+                try:
+                    with st.spinner("Evaluating your answers..."):
+                        st.session_state.practice_result = evaluate_exam_answers(
+                            questions=st.session_state.practice_questions,
+                            student_answers=answers_list,
+                            reference_context=reference_context,
+                        )
+                except LLMError as e:
+                    show_error_card(e.user_message)
+                    st.stop()
 
                 st.rerun()
 
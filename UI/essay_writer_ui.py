@@ -1,5 +1,7 @@
 import streamlit as st
-from services.ai_essay_writer.essay_service import generate_essay
+from services.ai_essay_writer.essay_service import generate_essay_stream
+from services.core.llm_errors import LLMError
+from utils.ui_helpers import show_error_card
 
 
 def render_essay_writer():
@@ -24,12 +26,16 @@ def render_essay_writer():
     outline = st.text_area("Optional Outline")
 
     if st.button("Generate Essay", disabled=not topic):
-        essay = generate_essay(
-            topic=topic,
-            word_limit=word_limit,
-            tone=tone.lower(),
-            outline=outline,
-        )
-
         st.markdown("### 📄 Generated Essay")
-        st.write(essay)
+
+        try:
+            st.write_stream(
+                generate_essay_stream(
+                    topic=topic,
+                    word_limit=word_limit,
+                    tone=tone.lower(),
+                    outline=outline,
+                )
+            )
+        except LLMError as e:
+            show_error_card(e.user_message)
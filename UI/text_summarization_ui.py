@@ -1,8 +1,10 @@
 import streamlit as st
 from services.ai_text_summarization.summary_service import (
-    summarize_text,
+    summarize_text_stream,
     summarize_pdf,
 )
+from services.core.llm_errors import LLMError
+from utils.ui_helpers import show_error_card
 
 
 def render_text_summarizer():
@@ -25,12 +27,21 @@ def render_text_summarizer():
         text = st.text_area("Paste text here", height=250)
 
         if st.button("Generate Summary", disabled=not text):
-            summary = summarize_text(text=text, mode=mode_key)
-            st.write(summary)
+            try:
+                st.write_stream(
+                    summarize_text_stream(text=text, mode=mode_key)
+                )
+            except LLMError as e:
+                show_error_card(e.user_message)
 
     else:
         pdf = st.file_uploader("Upload PDF", type=["pdf"])
 
         if st.button("Generate Summary", disabled=pdf is None):
-            summary = summarize_pdf(pdf_file=pdf, mode=mode_key)
-            st.write(summary)
+            try:
+                summary = summarize_pdf(pdf_file=pdf, mode=mode_key)
+                st.write(summary)
+            except LLMError as e:
+                show_error_card(e.user_message)
+            except ValueError as e:
+                show_error_card(str(e))
@@ -1,5 +1,7 @@
 import streamlit as st
 from UI.navigation import render_navigation
+from services.core.embedding_service import warm_up_embedding_model
+from services.core.rerank_service import warm_up_rerank_model
 
 st.set_page_config(
     page_title="AI Learning Assistant",
@@ -7,4 +9,8 @@ st.set_page_config(
     layout="wide",
 )
 
+# Load the shared embedding (and rerank) models once per server process
+warm_up_embedding_model(background=True)
+warm_up_rerank_model(background=True)
+
 render_navigation()
@@ -0,0 +1,77 @@
+"""
+Recall vs latency of the VectorStoreService index backends.
+
+Synthetic clustered 384-dim unit vectors stand in for chunk
+embeddings; the flat index provides the ground truth.
+
+Usage:
+    python -m benchmarks.bench_ann_indexes --vectors 200000 --queries 500
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from services.core.index_factory import build_index
+
+
+DIMENSION = 384
+
+
+def synthetic_embeddings(n: int, clusters: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, DIMENSION), dtype=np.float32)
+    labels = rng.integers(0, clusters, size=n)
+
+    vectors = centers[labels] + 0.6 * rng.standard_normal(
+        (n, DIMENSION), dtype=np.float32
+    )
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    return np.ascontiguousarray(vectors)
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(
+        len(set(f) & set(t))
+        for f, t in zip(found.tolist(), truth.tolist())
+    )
+    return hits / truth.size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vectors", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    corpus = synthetic_embeddings(args.vectors, clusters=256, seed=0)
+    queries = synthetic_embeddings(args.queries, clusters=256, seed=1)
+
+    print(f"{args.vectors} vectors, {args.queries} queries, recall@{args.k}")
+    print(f"{'index':<8}{'build s':>10}{'ms/query':>12}{'recall':>10}")
+
+    truth = None
+
+    for index_type in ("flat", "ivf", "hnsw", "ivfpq"):
+        start = time.perf_counter()
+        index = build_index(index_type, corpus)
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, found = index.search(queries, args.k)
+        per_query_ms = (time.perf_counter() - start) * 1000 / args.queries
+
+        if truth is None:
+            truth = found
+
+        print(
+            f"{index_type:<8}{build_seconds:>10.2f}{per_query_ms:>12.3f}"
+            f"{recall_at_k(found, truth):>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Per-call latency: new Groq client per request vs the shared pooled client.
+
+Runs against a local stub of the chat completions endpoint, so the
+numbers isolate client construction and connection setup.
+
+Usage:
+    python -m benchmarks.bench_groq_client --calls 200
+"""
+
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+COMPLETION = json.dumps(
+    {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "stub",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": "ok"},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+).encode("utf-8")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    # buffer headers + body into one send; separate small writes on a
+    # reused connection stall on Nagle / delayed ACK
+    wbufsize = -1
+
+    def do_POST(self):  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(COMPLETION)))
+        self.end_headers()
+        self.wfile.write(COMPLETION)
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+def _call(client) -> float:
+    start = time.perf_counter()
+    client.chat.completions.create(
+        model="stub",
+        messages=[{"role": "user", "content": "ping"}],
+        max_tokens=1,
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def _report(label: str, samples) -> None:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(
+        f"{label:<22} mean={statistics.mean(samples):7.2f} ms  "
+        f"p50={statistics.median(samples):7.2f} ms  p95={p95:7.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    os.environ["GROQ_BASE_URL"] = base_url
+    os.environ.setdefault("GROQ_API_KEY", "bench")
+
+    from groq import Groq
+    from services.core.groq_client import get_groq_client
+
+    per_call = [
+        _call(Groq(api_key="bench", base_url=base_url))
+        for _ in range(args.calls)
+    ]
+
+    shared = get_groq_client()
+    _call(shared)  # open the pooled connection
+    pooled = [_call(shared) for _ in range(args.calls)]
+
+    _report("client per call", per_call)
+    _report("shared pooled client", pooled)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
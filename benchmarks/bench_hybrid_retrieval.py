@@ -0,0 +1,164 @@
+"""
+Exact-term retrieval: dense vs BM25 vs hybrid (RRF) on one PDF.
+
+Each query asks about the rarest term of a randomly chosen chunk
+("what is <term>"); a query is a hit when one of the top-k chunks
+literally contains that term. Latency excludes query embedding,
+which is shared by the dense and hybrid paths.
+
+Without --pdf a synthetic glossary-style PDF is generated.
+
+Usage:
+    python -m benchmarks.bench_hybrid_retrieval --queries 300 --top-k 4
+    python -m benchmarks.bench_hybrid_retrieval --pdf lecture.pdf
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from benchmarks.bench_pdf_ingest import _Upload
+
+
+SYLLABLES = ["ka", "lo", "mi", "tre", "vo", "zan", "qu", "ir", "pha", "sel"]
+
+SENTENCES = [
+    "is a process that converts energy stored in nutrients into a usable form.",
+    "regulates the rate of the reaction by binding to the active site.",
+    "is measured in joules and depends on temperature and pressure.",
+    "describes how a signal travels across the membrane of a cell.",
+    "is an algorithm that sorts the input by repeatedly merging halves.",
+    "explains why the orbit of a planet is an ellipse rather than a circle.",
+]
+
+
+def build_glossary_pdf(path: str, pages: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    pdf = canvas.Canvas(path, pagesize=A4)
+    _, height = A4
+
+    for _ in range(pages):
+        y = height - 40
+        pdf.setFont("Helvetica", 9)
+
+        for _ in range(50):
+            term = "".join(rng.choice(SYLLABLES, size=3))
+            acronym = "".join(rng.choice(list("ABCDEFGHKLMNPRST"), size=3))
+            sentence = SENTENCES[rng.integers(len(SENTENCES))]
+
+            pdf.drawString(40, y, f"{term.capitalize()} ({acronym}) {sentence}")
+            y -= 14
+
+        pdf.showPage()
+
+    pdf.save()
+
+
+def build_store(pdf_bytes: bytes):
+    from services.core.embedding_service import EmbeddingService
+    from services.core.pdf_service import chunk_pdf_documents, load_pdf_documents
+    from services.core.vectorstore_service import VectorStoreService
+
+    chunks = chunk_pdf_documents(load_pdf_documents(_Upload(pdf_bytes)))
+
+    embeddings = EmbeddingService().embed_texts_array(
+        [doc.page_content for doc in chunks]
+    )
+
+    store = VectorStoreService(embedding_dimension=embeddings.shape[1])
+    store.add_documents(embeddings, chunks)
+
+    return store
+
+
+def sample_queries(store, count: int, seed: int):
+    from services.core.lexical_index_service import tokenize
+
+    token_sets = [set(tokenize(doc.page_content)) for doc in store.documents]
+    document_frequency = Counter(t for tokens in token_sets for t in tokens)
+
+    rng = np.random.default_rng(seed)
+    queries = []
+
+    for chunk_id in rng.integers(0, len(token_sets), size=count):
+        candidates = [t for t in token_sets[chunk_id] if len(t) > 3]
+        if not candidates:
+            continue
+
+        term = min(candidates, key=document_frequency.get)
+        queries.append((f"what is {term}", term))
+
+    return queries, token_sets
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pdf")
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--top-k", type=int, default=4)
+    parser.add_argument("--fetch-k", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.pdf:
+        with open(args.pdf, "rb") as f:
+            pdf_bytes = f.read()
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "glossary.pdf")
+            build_glossary_pdf(path, args.pages, args.seed)
+            with open(path, "rb") as f:
+                pdf_bytes = f.read()
+
+    from services.core.embedding_service import EmbeddingService
+
+    store = build_store(pdf_bytes)
+    queries, token_sets = sample_queries(store, args.queries, args.seed)
+
+    query_embeddings = EmbeddingService().embed_queries_array(
+        [text for text, _ in queries]
+    )
+
+    print(
+        f"chunks={len(store.documents)} queries={len(queries)} "
+        f"top_k={args.top_k} lexical_index={store.lexical_index.nbytes() / 1024:.0f} KB"
+    )
+
+    modes = {
+        "dense": lambda q, e: store.search_ids(e, args.top_k),
+        "bm25": lambda q, e: store.lexical_search_ids(q, args.top_k),
+        "hybrid": lambda q, e: store.hybrid_search_ids(
+            e, q, args.top_k, fetch_k=args.fetch_k
+        ),
+    }
+
+    for name, search in modes.items():
+        hits = 0
+        latencies = []
+
+        for (text, term), embedding in zip(queries, query_embeddings):
+            start = time.perf_counter()
+            ids, _ = search(text, embedding)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            hits += any(term in token_sets[i] for i in ids.tolist())
+
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+
+        print(
+            f"{name:<7} hit_rate={hits / len(queries):6.1%}  "
+            f"mean={statistics.mean(latencies):6.2f} ms  p95={p95:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Page extraction benchmark: PyPDFLoader vs page-parallel extraction.
+
+Usage:
+    python -m benchmarks.bench_pdf_extract --pages 500 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.bench_pdf_ingest import _Upload, build_pdf
+
+
+def time_legacy(pdf_path: str) -> float:
+    from langchain_community.document_loaders import PyPDFLoader
+
+    start = time.perf_counter()
+    PyPDFLoader(pdf_path).load()
+    return time.perf_counter() - start
+
+
+def time_parallel(data: bytes, workers: int) -> float:
+    from services.core.pdf_service import load_pdf_documents
+
+    start = time.perf_counter()
+    documents = load_pdf_documents(_Upload(data), workers=workers)
+    elapsed = time.perf_counter() - start
+
+    # order / metadata must match the serial loader
+    assert [d.metadata["page"] for d in documents] == list(range(len(documents)))
+
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, "bench.pdf")
+        build_pdf(pdf_path, args.pages)
+
+        with open(pdf_path, "rb") as f:
+            data = f.read()
+
+        baseline = time_legacy(pdf_path)
+        print(f"PyPDFLoader          {baseline:7.2f}s  1.00x")
+
+        for workers in args.workers:
+            elapsed = time_parallel(data, workers)
+            print(
+                f"parallel workers={workers:<3} {elapsed:7.2f}s  "
+                f"{baseline / elapsed:4.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
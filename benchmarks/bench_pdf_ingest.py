@@ -0,0 +1,150 @@
+"""
+PDF ingestion benchmark: temp-file PyPDFLoader path vs in-memory path.
+
+Generates a synthetic N-page PDF with reportlab, then runs each
+ingestion path in a fresh subprocess so peak RSS is measured
+independently.
+
+Usage:
+    python -m benchmarks.bench_pdf_ingest --pages 300
+"""
+
+import argparse
+import hashlib
+import importlib
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+
+PARAGRAPH = (
+    "Cellular respiration converts glucose into ATP through glycolysis, "
+    "the Krebs cycle and oxidative phosphorylation. "
+)
+
+
+def build_pdf(path: str, pages: int) -> None:
+    pdf = canvas.Canvas(path, pagesize=A4)
+    _, height = A4
+
+    for page in range(pages):
+        y = height - 40
+        pdf.setFont("Helvetica", 9)
+        for line in range(60):
+            pdf.drawString(40, y, f"[{page}:{line}] {PARAGRAPH}")
+            y -= 12
+        pdf.showPage()
+
+    pdf.save()
+
+
+class _Upload(io.BytesIO):
+    """Mimics Streamlit's UploadedFile (a BytesIO with a name)."""
+
+    name = "bench.pdf"
+
+
+
+# Ingestion paths
+
+
+def ingest_legacy(data: bytes) -> int:
+    from langchain_community.document_loaders import PyPDFLoader
+
+    upload = _Upload(data)
+    hashlib.md5(upload.getvalue()).hexdigest()
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+        tmp.write(upload.read())
+        tmp_path = tmp.name
+
+    documents = PyPDFLoader(tmp_path).load()
+    os.remove(tmp_path)
+
+    return len(documents)
+
+
+def ingest_streaming(data: bytes) -> int:
+    from services.core.cache_service import CacheService
+    from services.core.pdf_service import load_pdf_documents
+
+    upload = _Upload(data)
+    CacheService.generate_file_hash(upload)
+
+    return len(load_pdf_documents(upload))
+
+
+MODES = {
+    "legacy": ingest_legacy,
+    "streaming": ingest_streaming,
+}
+
+# imported by every child before the baseline, so import cost (the
+# streaming path pulls in streamlit / faiss / langchain) is not
+# counted against either mode
+PRELOAD_MODULES = (
+    "langchain_community.document_loaders",
+    "services.core.cache_service",
+    "services.core.pdf_service",
+)
+
+
+def run_child(mode: str, path: str) -> None:
+    with open(path, "rb") as f:
+        data = f.read()
+
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    pages = MODES[mode](data)
+    elapsed = time.perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(
+        f"{mode:<10} pages={pages:<5} time={elapsed:7.2f}s "
+        f"peak_rss={peak_kb / 1024:8.1f} MB "
+        f"(+{(peak_kb - baseline_kb) / 1024:.1f} MB during ingest)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--child", choices=list(MODES))
+    parser.add_argument("--pdf")
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.pdf)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, "bench.pdf")
+        build_pdf(pdf_path, args.pages)
+
+        size_mb = os.path.getsize(pdf_path) / (1024 * 1024)
+        print(f"synthetic PDF: {args.pages} pages, {size_mb:.1f} MB")
+
+        for mode in MODES:
+            subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.bench_pdf_ingest",
+                    "--child", mode, "--pdf", pdf_path,
+                ],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
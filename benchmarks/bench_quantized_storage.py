@@ -0,0 +1,97 @@
+"""
+Memory vs recall of VectorStoreService vector storage modes.
+
+Compares the float32 flat index with float16 and int8 scalar
+quantization (int8 also with full-precision rescoring). Synthetic
+clustered 384-dim unit vectors stand in for chunk embeddings; the
+float32 flat index provides the ground truth.
+
+Memory is reported per million chunks for the vector index alone
+(Document / BM25 overhead is the same in every mode). Rescoring
+rows live in RAM only until the store is saved; afterwards they are
+memory-mapped from disk.
+
+Usage:
+    python -m benchmarks.bench_quantized_storage --vectors 200000 --queries 500
+"""
+
+import argparse
+import time
+
+import numpy as np
+from langchain.schema import Document
+
+from benchmarks.bench_ann_indexes import recall_at_k, synthetic_embeddings
+from services.core.vectorstore_service import VectorStoreService
+
+
+MODES = [
+    ("float32", "float32", False),
+    ("float16", "float16", False),
+    ("int8", "int8", False),
+    ("int8+rescore", "int8", True),
+]
+
+
+def build_store(corpus: np.ndarray, storage: str, rescore: bool):
+    store = VectorStoreService(
+        embedding_dimension=corpus.shape[1],
+        index_type="flat",
+        storage=storage,
+        rescore=rescore,
+    )
+
+    empty = [Document(page_content="") for _ in range(len(corpus))]
+    store.add_documents(corpus, empty)
+    store.optimize_index()
+
+    return store
+
+
+def search_all(store, queries: np.ndarray, k: int) -> np.ndarray:
+    return np.stack(
+        [store.search_ids(query, top_k=k)[0] for query in queries]
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vectors", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    corpus = synthetic_embeddings(args.vectors, clusters=256, seed=0)
+    queries = synthetic_embeddings(args.queries, clusters=256, seed=1)
+
+    per_million = 1_000_000 / args.vectors
+
+    print(f"{args.vectors} vectors, {args.queries} queries, recall@{args.k}")
+    print(
+        f"{'storage':<14}{'index MB/1M':>13}{'rescore MB/1M':>15}"
+        f"{'ms/query':>10}{'recall':>9}"
+    )
+
+    truth = None
+
+    for label, storage, rescore in MODES:
+        store = build_store(corpus, storage, rescore)
+
+        start = time.perf_counter()
+        found = search_all(store, queries, args.k)
+        per_query_ms = (time.perf_counter() - start) * 1000 / args.queries
+
+        if truth is None:
+            truth = found
+
+        index_mb = store.index_nbytes() * per_million / (1024 * 1024)
+        rescore_mb = store.full_vectors_nbytes() * per_million / (1024 * 1024)
+
+        print(
+            f"{label:<14}{index_mb:>13.1f}{rescore_mb:>15.1f}"
+            f"{per_query_ms:>10.3f}{recall_at_k(found, truth):>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 import re
 
-from services.core.groq_client import get_groq_response
+from services.core.groq_client import get_groq_response, stream_groq_response
 from utils.prompt_templates import ESSAY_PROMPT
 from utils.constants import DEFAULT_WORD_LIMIT, DEFAULT_TONE
 
@@ -39,14 +39,14 @@ def _estimate_token_limit(word_limit: int) -> int:
 # Main service
 
 
-def generate_essay(
+def _build_essay_prompt(
     topic: str,
-    word_limit: Optional[int] = None,
-    tone: Optional[str] = None,
-    outline: Optional[str] = None,
-) -> str:
+    word_limit: Optional[int],
+    tone: Optional[str],
+    outline: Optional[str],
+) -> Tuple[str, int]:
     """
-    Generates a structured academic essay.
+    Returns (prompt, max_tokens) for an essay request.
     """
 
     
@@ -71,6 +71,23 @@ def generate_essay(
         outline=cleaned_outline,
     )
 
+    return prompt, max_tokens
+
+
+def generate_essay(
+    topic: str,
+    word_limit: Optional[int] = None,
+    tone: Optional[str] = None,
+    outline: Optional[str] = None,
+) -> str:
+    """
+    Generates a structured academic essay.
+    """
+
+    prompt, max_tokens = _build_essay_prompt(
+        topic, word_limit, tone, outline
+    )
+
     
     # LLM call
     
@@ -78,6 +95,7 @@ def generate_essay(
         prompt=prompt,
         temperature=0.7,
         max_tokens=max_tokens,
+        use_cache=False,
     )
 
     
@@ -86,3 +104,25 @@ def generate_essay(
     essay = re.sub(r"\n{3,}", "\n\n", essay).strip()
 
     return essay
+
+
+def generate_essay_stream(
+    topic: str,
+    word_limit: Optional[int] = None,
+    tone: Optional[str] = None,
+    outline: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Streams the essay token by token (for st.write_stream).
+    """
+
+    prompt, max_tokens = _build_essay_prompt(
+        topic, word_limit, tone, outline
+    )
+
+    yield from stream_groq_response(
+        prompt=prompt,
+        temperature=0.7,
+        max_tokens=max_tokens,
+        use_cache=False,
+    )
@@ -1,4 +1,14 @@
+import asyncio
 import re
+from functools import lru_cache
+from typing import Awaitable, Callable, List
+
+# Llama 3 uses a tiktoken BPE derived from cl100k_base, so cl100k
+# counts track the model closely; without tiktoken we fall back to
+# ~4 characters per token.
+TOKENIZER_ENCODING = "cl100k_base"
+CHARS_PER_TOKEN = 4
+
 
 def clean_text(text: str) -> str:
     text = text.replace("\r", "\n")
@@ -6,5 +16,96 @@ def clean_text(text: str) -> str:
     return text.strip()
 
 
+@lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(TOKENIZER_ENCODING)
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Tokenizer-based prompt length estimate.
+    """
+
+    encoding = _get_encoding()
+
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+
+    return len(encoding.encode(text, disallowed_special=()))
+
+
 def estimate_token_limit(word_limit: int) -> int:
+    """
+    max_tokens budget for a response of about word_limit words.
+
+    A response cannot be tokenized before it exists, so this stays
+    a words → tokens ratio; only prompt sizes use count_tokens().
+    """
     return int(word_limit * 2)
+
+
+def group_by_token_budget(texts: List[str], budget: int) -> List[List[str]]:
+    """
+    Packs consecutive texts into groups whose token total stays
+    within budget (a single oversized text forms its own group).
+    """
+
+    groups: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for text in texts:
+        tokens = count_tokens(text)
+
+        if current and current_tokens + tokens > budget:
+            groups.append(current)
+            current, current_tokens = [], 0
+
+        current.append(text)
+        current_tokens += tokens
+
+    if current:
+        groups.append(current)
+
+    return groups
+
+
+async def reduce_by_token_budget(
+    texts: List[str],
+    merge: Callable[[List[str]], Awaitable[str]],
+    budget: int,
+) -> List[str]:
+    """
+    Merges texts level by level (the groups of a level in parallel)
+    until the rest fits one budget-sized prompt; returns that level.
+
+    Texts too large to share a group are merged pairwise, so every
+    merge prompt stays bounded; two such texts are returned as they
+    are for the caller's final merge.
+    """
+
+    async def _merge_group(group: List[str]) -> str:
+        return group[0] if len(group) == 1 else await merge(group)
+
+    level = list(texts)
+
+    while True:
+        groups = group_by_token_budget(level, budget)
+
+        # fits in one prompt (or nothing to merge)
+        if len(groups) <= 1:
+            return level
+
+        # no two texts fit together → force pairwise merges
+        if len(groups) == len(level):
+            groups = [level[i:i + 2] for i in range(0, len(level), 2)]
+
+            if len(groups) <= 1:
+                return level
+
+        level = list(await asyncio.gather(*(_merge_group(g) for g in groups)))
@@ -1,10 +1,18 @@
-from typing import Optional, List
+from typing import Iterator, Optional, List
+import asyncio
+import os
 import re
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-from services.core.groq_client import get_groq_response
+from services.core.groq_client import (
+    create_async_groq_client,
+    get_groq_response,
+    get_groq_response_async,
+    stream_groq_response,
+)
 from services.core.pdf_service import load_pdf_documents
+from services.core.rate_limiter_service import PRIORITY_BACKGROUND
 
 from utils.prompt_templates import (
     SHORT_SUMMARY_PROMPT,
@@ -16,6 +24,8 @@ from utils.prompt_templates import (
 from services.ai_text_summarization.summarization_utils import (
     estimate_token_limit,
     clean_text,
+    count_tokens,
+    reduce_by_token_budget,
 )
 
 
@@ -23,49 +33,149 @@ from services.ai_text_summarization.summarization_utils import (
 # INTERNAL HELPERS
 
 
-def _summarize_chunks(
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "8"))
+
+# Token budgets (cl100k-style counts, see summarization_utils)
+MAP_CHUNK_TOKENS = 1500
+MAP_CHUNK_OVERLAP_TOKENS = 150
+MERGE_INPUT_TOKEN_BUDGET = 6000
+
+
+def _build_summary_prompt(
+    text: str,
+    mode: str,
+    max_words: Optional[int],
+) -> str:
+
+    cleaned_text = clean_text(text)
+
+    system_prompt = (
+        BULLET_SUMMARY_PROMPT
+        if mode == "bullet"
+        else SHORT_SUMMARY_PROMPT
+    )
+
+    word_instruction = (
+        f"Limit the summary to approximately {max_words} words."
+        if max_words
+        else "Be concise while preserving key meaning."
+    )
+
+    return f"""
+{system_prompt}
+
+{word_instruction}
+
+Text:
+\"\"\"
+{cleaned_text}
+\"\"\"
+"""
+
+
+def _build_merge_prompt(summaries: List[str], mode: str) -> str:
+
+    combined = "\n".join(summaries)
+
+    if mode == "bullet":
+        return FINAL_BULLET_MERGE_PROMPT.format(
+            summaries=combined
+        )
+
+    return FINAL_PARAGRAPH_MERGE_PROMPT.format(
+        summaries=combined
+    )
+
+
+async def _map_reduce_async(
     chunks: List[str],
     mode: str,
     max_words: Optional[int],
+    concurrency: int,
 ) -> str:
     """
-    Summarizes multiple text chunks and merges results.
+    Map: summarizes every chunk concurrently (at most `concurrency`
+    requests in flight), results in chunk order.
+
+    Reduce: while the partial summaries exceed the merge budget,
+    groups them by token count and merges each group in parallel,
+    level by level, until one final merge prompt fits. Summaries too
+    large to share a group are merged pairwise, so every merge
+    prompt stays bounded.
     """
 
-    partial_summaries = []
+    if not chunks:
+        raise ValueError("No text to summarize.")
 
-    for chunk in chunks:
-        summary = summarize_text(
-            text=chunk,
-            mode=mode,
-            max_words=max_words,
-        )
-        partial_summaries.append(summary)
+    semaphore = asyncio.Semaphore(concurrency)
 
-    combined = "\n".join(partial_summaries)
+    # a missing API key raises LLMConfigurationError here
+    client = create_async_groq_client()
 
-    
-    # Final merge stage
- 
+    map_tokens = estimate_token_limit(
+        max_words if max_words else 250
+    )
+    merge_tokens = estimate_token_limit(
+        max_words if max_words else 300
+    )
 
-    if mode == "bullet":
-        final_prompt = FINAL_BULLET_MERGE_PROMPT.format(
-            summaries=combined
+    # intermediate merges must leave room for a sibling in the next
+    # level's prompt
+    reduce_tokens = min(merge_tokens, MERGE_INPUT_TOKEN_BUDGET // 2)
+
+    async def _call(prompt: str, max_tokens: int) -> str:
+        async with semaphore:
+            response = await get_groq_response_async(
+                prompt=prompt,
+                temperature=0.3,
+                max_tokens=max_tokens,
+                client=client,
+                priority=PRIORITY_BACKGROUND,
+            )
+
+        return re.sub(r"\n{3,}", "\n\n", response).strip()
+
+    async def _merge(group: List[str]) -> str:
+        return await _call(_build_merge_prompt(group, mode), reduce_tokens)
+
+    try:
+        # map stage (gather() preserves input order)
+        level = await asyncio.gather(
+            *(
+                _call(_build_summary_prompt(chunk, mode, max_words), map_tokens)
+                for chunk in chunks
+            )
         )
-    else:
-        final_prompt = FINAL_PARAGRAPH_MERGE_PROMPT.format(
-            summaries=combined
+
+        # tree reduce
+        level = await reduce_by_token_budget(
+            level, _merge, MERGE_INPUT_TOKEN_BUDGET
         )
 
-    final_summary = get_groq_response(
-        prompt=final_prompt,
-        temperature=0.3,
-        max_tokens=estimate_token_limit(
-            max_words if max_words else 300
-        ),
-    )
+        return await _call(_build_merge_prompt(level, mode), merge_tokens)
 
-    return final_summary.strip()
+    finally:
+        await client.close()
+
+
+def _summarize_chunks(
+    chunks: List[str],
+    mode: str,
+    max_words: Optional[int],
+    concurrency: int = SUMMARY_CONCURRENCY,
+) -> str:
+    """
+    Summarizes multiple text chunks and merges results.
+    """
+
+    return asyncio.run(
+        _map_reduce_async(
+            chunks=chunks,
+            mode=mode,
+            max_words=max_words,
+            concurrency=concurrency,
+        )
+    )
 
 
 
@@ -84,30 +194,7 @@ def summarize_text(
     if not text or not text.strip():
         raise ValueError("Input text is empty.")
 
-    cleaned_text = clean_text(text)
-
-    system_prompt = (
-        BULLET_SUMMARY_PROMPT
-        if mode == "bullet"
-        else SHORT_SUMMARY_PROMPT
-    )
-
-    word_instruction = (
-        f"Limit the summary to approximately {max_words} words."
-        if max_words
-        else "Be concise while preserving key meaning."
-    )
-
-    prompt = f"""
-{system_prompt}
-
-{word_instruction}
-
-Text:
-\"\"\"
-{cleaned_text}
-\"\"\"
-"""
+    prompt = _build_summary_prompt(text, mode, max_words)
 
     max_tokens = estimate_token_limit(
         max_words if max_words else 250
@@ -124,6 +211,27 @@ Text:
     return summary
 
 
+def summarize_text_stream(
+    text: str,
+    mode: str = "short",
+    max_words: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Streaming variant of summarize_text (for st.write_stream).
+    """
+
+    if not text or not text.strip():
+        raise ValueError("Input text is empty.")
+
+    yield from stream_groq_response(
+        prompt=_build_summary_prompt(text, mode, max_words),
+        temperature=0.3,
+        max_tokens=estimate_token_limit(
+            max_words if max_words else 250
+        ),
+    )
+
+
 
 # PDF SUMMARIZATION
 
@@ -144,12 +252,19 @@ def summarize_pdf(
     )
 
     splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1200,
-        chunk_overlap=150,
+        chunk_size=MAP_CHUNK_TOKENS,
+        chunk_overlap=MAP_CHUNK_OVERLAP_TOKENS,
+        length_function=count_tokens,
     )
 
     chunks = splitter.split_text(full_text)
 
+    if not chunks:
+        raise ValueError(
+            "No text could be extracted from this PDF "
+            "(scanned or image-only pages are not supported)."
+        )
+
     return _summarize_chunks(
         chunks=chunks,
         mode=mode,
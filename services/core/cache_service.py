@@ -3,20 +3,93 @@
 import hashlib
 import streamlit as st
 
+from services.core.index_store_service import IndexStoreService
+from services.core.shared_cache_service import SharedVectorStoreCache
+
+
+HASH_BLOCK_SIZE = 1024 * 1024  # 1 MB
+
+
+@st.cache_resource
+def _get_index_store() -> IndexStoreService:
+    return IndexStoreService()
+
+
+@st.cache_resource
+def _get_shared_cache() -> SharedVectorStoreCache:
+    return SharedVectorStoreCache()
+
 
 class CacheService:
 
     @staticmethod
     def generate_file_hash(file) -> str:
+        """
+        Hashes the upload in fixed-size blocks without copying it.
+        """
+
+        hasher = hashlib.md5()
+
+        # BytesIO / UploadedFile → hash slices of the live buffer
+        if hasattr(file, "getbuffer"):
+            with file.getbuffer() as buffer:
+                for start in range(0, len(buffer), HASH_BLOCK_SIZE):
+                    hasher.update(buffer[start:start + HASH_BLOCK_SIZE])
+
+            return hasher.hexdigest()
+
+        position = file.tell()
+        file.seek(0)
+
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+            hasher.update(block)
 
-        file_bytes = file.getvalue()
-        return hashlib.md5(file_bytes).hexdigest()
+        file.seek(position)
+
+        return hasher.hexdigest()
 
     @staticmethod
     def get_cached_vectorstore(file_hash: str):
-        return st.session_state.get(f"vectorstore_{file_hash}")
+        key = f"vectorstore_{file_hash}"
+
+        vectorstore = st.session_state.get(key)
+        if vectorstore is not None:
+            return vectorstore
+
+        # 1. in-memory store shared by all sessions
+        shared_cache = _get_shared_cache()
+        vectorstore = shared_cache.get(file_hash)
+
+        # 2. on-disk index
+        if vectorstore is None:
+            vectorstore = _get_index_store().get(file_hash)
+            if vectorstore is not None:
+                vectorstore = shared_cache.put(file_hash, vectorstore)
+
+        if vectorstore is not None:
+            st.session_state[key] = vectorstore
+
+        return vectorstore
+
+    @staticmethod
+    def publish_vectorstore(file_hash: str, vectorstore):
+        """
+        Registers a finished store in the shared and on-disk caches.
+
+        Does not touch session state, so it is safe to call from a
+        background ingest thread. Returns the canonical instance.
+        """
+
+        shared = _get_shared_cache().put(file_hash, vectorstore)
+
+        if shared is vectorstore:
+            _get_index_store().put(file_hash, vectorstore)
+
+        return shared
 
     @staticmethod
     def set_cached_vectorstore(file_hash: str, vectorstore):
-        st.session_state[f"vectorstore_{file_hash}"] = vectorstore
+        shared = CacheService.publish_vectorstore(file_hash, vectorstore)
+        st.session_state[f"vectorstore_{file_hash}"] = shared
 
+        return shared
@@ -1,15 +1,165 @@
-from typing import List
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from sentence_transformers import SentenceTransformer
 
 
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "2048"))
+
+
+
+# Process-wide model registry
+
+
+_MODEL_REGISTRY: Dict[str, SentenceTransformer] = {}
+_MODEL_LOAD_SECONDS: Dict[str, float] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_embedding_model(
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+) -> SentenceTransformer:
+    """
+    Returns the shared SentenceTransformer for model_name.
+
+    The model is loaded once per process and reused by every
+    Streamlit session / thread afterwards.
+    """
+
+    model = _MODEL_REGISTRY.get(model_name)
+    if model is not None:
+        return model
+
+    with _REGISTRY_LOCK:
+        # another thread may have finished loading while we waited
+        model = _MODEL_REGISTRY.get(model_name)
+        if model is None:
+            start = time.perf_counter()
+            model = SentenceTransformer(model_name)
+            _MODEL_LOAD_SECONDS[model_name] = time.perf_counter() - start
+            _MODEL_REGISTRY[model_name] = model
+
+    return model
+
+
+def get_model_load_time(
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+) -> Optional[float]:
+    """
+    Seconds spent loading model_name, or None if not loaded yet.
+    """
+    return _MODEL_LOAD_SECONDS.get(model_name)
+
+
+def warm_up_embedding_model(
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+    background: bool = False,
+) -> None:
+    """
+    Loads the embedding model ahead of the first request.
+
+    background=True loads it in a daemon thread so the first
+    page render is not blocked.
+    """
+
+    if model_name in _MODEL_REGISTRY:
+        return
+
+    if background:
+        threading.Thread(
+            target=get_embedding_model,
+            args=(model_name,),
+            daemon=True,
+        ).start()
+    else:
+        get_embedding_model(model_name)
+
+
+
+# Query embedding cache
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.split())
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded LRU of query vectors keyed by (model name, normalized text).
+
+    Shared by every EmbeddingService in the process so canned and
+    repeated queries skip model inference.
+    """
+
+    def __init__(self, max_entries: int = QUERY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model_name: str, query: str) -> Optional[np.ndarray]:
+        key = (model_name, query)
+
+        with self._lock:
+            vector = self._entries.get(key)
+
+            if vector is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return vector.copy()
+
+    def put(self, model_name: str, query: str, vector: np.ndarray) -> None:
+        with self._lock:
+            self._entries[(model_name, query)] = vector.copy()
+            self._entries.move_to_end((model_name, query))
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_QUERY_CACHE = QueryEmbeddingCache()
+
+
+def get_query_cache_stats() -> Dict[str, int]:
+    return _QUERY_CACHE.stats()
+
+
+
+# Embedding service
+
+
 class EmbeddingService:
     def __init__(
         self,
-        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
     ):
-        self.model = SentenceTransformer(model_name)
+        self.model_name = model_name
+        self.model = get_embedding_model(model_name)
+
+    def embed_texts_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Returns an (n, d) C-contiguous float32 matrix of unit vectors.
+        """
 
-    def embed_texts(self, texts: List[str]) -> List[List[float]]:
         embeddings = self.model.encode(
             texts,
             convert_to_numpy=True,
@@ -17,13 +167,58 @@ class EmbeddingService:
             show_progress_bar=False,
         )
 
-        return embeddings.tolist()
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+    def embed_query_array(self, query: str) -> np.ndarray:
+        """
+        Returns a (d,) float32 unit vector (memoized per query).
+        """
+
+        query = normalize_query(query)
+
+        cached = _QUERY_CACHE.get(self.model_name, query)
+        if cached is not None:
+            return cached
 
-    def embed_query(self, query: str) -> List[float]:
         embedding = self.model.encode(
             query,
             convert_to_numpy=True,
             normalize_embeddings=True,
         )
 
-        return embedding.tolist()
+        embedding = np.ascontiguousarray(embedding, dtype=np.float32)
+        _QUERY_CACHE.put(self.model_name, query, embedding)
+
+        return embedding
+
+    def embed_queries_array(self, queries: List[str]) -> np.ndarray:
+        """
+        Returns an (n, d) matrix for several queries; only cache
+        misses are encoded, in a single model call.
+        """
+
+        queries = [normalize_query(q) for q in queries]
+
+        vectors: List[Optional[np.ndarray]] = [
+            _QUERY_CACHE.get(self.model_name, q) for q in queries
+        ]
+
+        missing = [i for i, v in enumerate(vectors) if v is None]
+
+        if missing:
+            encoded = self.embed_texts_array([queries[i] for i in missing])
+
+            for i, vector in zip(missing, encoded):
+                _QUERY_CACHE.put(self.model_name, queries[i], vector)
+                vectors[i] = vector
+
+        return np.ascontiguousarray(np.vstack(vectors), dtype=np.float32)
+
+
+    # List-based compatibility API
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_texts_array(texts).tolist()
+
+    def embed_query(self, query: str) -> List[float]:
+        return self.embed_query_array(query).tolist()
@@ -1,8 +1,27 @@
+import asyncio
 import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import httpx
 import streamlit as st
-from groq import Groq
+from groq import AsyncGroq, Groq
 from dotenv import load_dotenv
-from typing import Optional
+from typing import Dict, Iterator, List, Optional
+
+from services.core.response_cache_service import ResponseCacheService
+from services.core.llm_errors import (
+    LLMConfigurationError,
+    LLMError,
+    LLMRateLimitError,
+    classify_error,
+)
+from services.core.rate_limiter_service import (
+    RequestScheduler,
+    PRIORITY_DEFAULT,
+    PRIORITY_INTERACTIVE,
+)
 
 load_dotenv()
 
@@ -13,32 +32,330 @@ load_dotenv()
 
 DEFAULT_MODEL = "llama-3.3-70b-versatile"
 
+SYSTEM_PROMPT = "You are a helpful educational assistant."
 
+# Response cache: only near-deterministic generations are reused
+RESPONSE_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+RESPONSE_CACHE_MAX_TEMPERATURE = 0.3
 
-# Client loader
+# Shared HTTP connection pool
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL") or None
+GROQ_TIMEOUT_SECONDS = float(os.getenv("GROQ_TIMEOUT_SECONDS", "60"))
+GROQ_CONNECT_TIMEOUT_SECONDS = float(os.getenv("GROQ_CONNECT_TIMEOUT_SECONDS", "10"))
+GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", "20"))
+GROQ_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("GROQ_MAX_KEEPALIVE_CONNECTIONS", "10"))
+GROQ_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("GROQ_KEEPALIVE_EXPIRY_SECONDS", "60"))
 
+# Retry / hedging policy defaults
+RETRY_MAX_ATTEMPTS = int(os.getenv("GROQ_RETRY_MAX_ATTEMPTS", "4"))
+RETRY_BASE_DELAY_SECONDS = 1.0
+RETRY_MAX_DELAY_SECONDS = 30.0
+HEDGE_AFTER_SECONDS = (
+    float(os.getenv("GROQ_HEDGE_AFTER_SECONDS"))
+    if os.getenv("GROQ_HEDGE_AFTER_SECONDS")
+    else None
+)
 
-def get_groq_client() -> Groq:
+
+
+# Response cache loader
+
+
+_response_cache: Optional[ResponseCacheService] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCacheService]:
+    """
+    Returns the process-wide response cache (None when disabled).
+    """
+
+    global _response_cache
+
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCacheService()
+
+    return _response_cache
+
+
+
+# Request scheduler loader
+
+
+_request_scheduler: Optional[RequestScheduler] = None
+_request_scheduler_lock = threading.Lock()
+
+
+def get_request_scheduler() -> RequestScheduler:
+    """
+    Returns the process-wide RPM/TPM scheduler shared by all calls.
+    """
+
+    global _request_scheduler
+
+    if _request_scheduler is None:
+        with _request_scheduler_lock:
+            if _request_scheduler is None:
+                _request_scheduler = RequestScheduler()
+
+    return _request_scheduler
+
+
+def get_scheduler_stats() -> Dict[str, float]:
+    """
+    Queue depth and wait-time metrics of the request scheduler.
     """
-    Returns Groq client using Streamlit secrets or .env.
+    return get_request_scheduler().stats()
 
+
+
+# Client loader
+
+
+_groq_client: Optional[Groq] = None
+_groq_client_lock = threading.Lock()
+
+
+def _resolve_api_key() -> str:
+    """
     Priority:
     1. Streamlit Cloud secrets
     2. Local .env file
     """
 
-    api_key = (
-        st.secrets.get("GROQ_API_KEY")
-        or os.getenv("GROQ_API_KEY")
-    )
+    try:
+        api_key = st.secrets.get("GROQ_API_KEY")
+    except FileNotFoundError:
+        api_key = None
+
+    api_key = api_key or os.getenv("GROQ_API_KEY")
 
     if not api_key:
-        raise RuntimeError(
+        raise LLMConfigurationError(
             "Groq API key not found.\n"
             "Add GROQ_API_KEY to Streamlit Secrets or .env file."
         )
 
-    return Groq(api_key=api_key)
+    return api_key
+
+
+def create_groq_client(api_key: str) -> Groq:
+    """
+    Builds a Groq client on a keep-alive httpx connection pool.
+    """
+
+    http_client = httpx.Client(
+        timeout=httpx.Timeout(
+            GROQ_TIMEOUT_SECONDS,
+            connect=GROQ_CONNECT_TIMEOUT_SECONDS,
+        ),
+        limits=httpx.Limits(
+            max_connections=GROQ_MAX_CONNECTIONS,
+            max_keepalive_connections=GROQ_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=GROQ_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+    # retries are handled by RetryPolicy, not the SDK
+    return Groq(
+        api_key=api_key,
+        base_url=GROQ_BASE_URL,
+        http_client=http_client,
+        max_retries=0,
+    )
+
+
+def get_groq_client() -> Groq:
+    """
+    Returns the process-wide Groq client using Streamlit secrets or .env.
+
+    Built once and shared by every session/thread so calls reuse
+    pooled TCP/TLS connections instead of reconnecting each time.
+    """
+
+    global _groq_client
+
+    if _groq_client is None:
+        with _groq_client_lock:
+            if _groq_client is None:
+                _groq_client = create_groq_client(_resolve_api_key())
+
+    return _groq_client
+
+
+
+# Retry policy
+
+
+class RetryPolicy:
+    """
+    How failed calls are retried.
+
+    Only retryable errors (rate limit, timeout, transport) are
+    retried, with Retry-After or jittered exponential backoff.
+    hedge_after_seconds (sync calls only) fires a second identical
+    request if the first has not answered by then and keeps
+    whichever finishes first; None disables hedging.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = RETRY_MAX_ATTEMPTS,
+        base_delay_seconds: float = RETRY_BASE_DELAY_SECONDS,
+        max_delay_seconds: float = RETRY_MAX_DELAY_SECONDS,
+        hedge_after_seconds: Optional[float] = HEDGE_AFTER_SECONDS,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.hedge_after_seconds = hedge_after_seconds
+
+    def should_retry(self, error: LLMError, attempt: int) -> bool:
+        return error.retryable and attempt + 1 < self.max_attempts
+
+    def delay(self, error: LLMError, attempt: int) -> float:
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay_seconds)
+
+        delay = self.base_delay_seconds * (2 ** attempt)
+        return min(delay, self.max_delay_seconds) * random.uniform(0.5, 1.0)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def _back_off(
+    policy: RetryPolicy,
+    error: LLMError,
+    attempt: int,
+) -> float:
+    """
+    Returns how long this caller should sleep before retrying.
+
+    Rate limits pause the shared scheduler instead, so every caller
+    backs off together.
+    """
+
+    delay = policy.delay(error, attempt)
+
+    if isinstance(error, LLMRateLimitError):
+        get_request_scheduler().pause(delay)
+        return 0.0
+
+    return delay
+
+
+
+# Shared request helpers
+
+
+def _build_messages(prompt: str) -> List[Dict[str, str]]:
+    return [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": prompt
+        },
+    ]
+
+
+def _resolve_cache(
+    use_cache: Optional[bool],
+    temperature: float,
+) -> Optional[ResponseCacheService]:
+
+    if use_cache is None:
+        use_cache = temperature <= RESPONSE_CACHE_MAX_TEMPERATURE
+
+    return get_response_cache() if use_cache else None
+
+
+def _estimate_request_tokens(
+    messages: List[Dict[str, str]],
+    max_tokens: int,
+) -> int:
+    # ~4 characters per prompt token, plus the full output budget
+    prompt_chars = sum(len(m["content"]) for m in messages)
+    return prompt_chars // 4 + max_tokens
+
+
+def _reported_tokens(response, fallback: int) -> int:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None) or fallback
+
+
+def _attempt_tokens(response, estimated_tokens: int, max_tokens: int) -> int:
+    # failed or cancelled attempts (response is None) are charged the
+    # prompt only
+    if response is None:
+        return estimated_tokens - max_tokens
+    return _reported_tokens(response, estimated_tokens)
+
+
+def _reported_stream_tokens(chunk) -> Optional[int]:
+    # Groq reports usage on the final stream chunk, under x_groq
+    usage = getattr(chunk, "usage", None) or getattr(
+        getattr(chunk, "x_groq", None), "usage", None
+    )
+    return getattr(usage, "total_tokens", None)
+
+
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_hedge_executor_lock = threading.Lock()
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+
+    if _hedge_executor is None:
+        with _hedge_executor_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(
+                    max_workers=GROQ_MAX_CONNECTIONS,
+                    thread_name_prefix="groq-hedge",
+                )
+
+    return _hedge_executor
+
+
+def _call_with_hedging(call, hedge_after_seconds: Optional[float]):
+    """
+    Runs call(); if it is still pending after hedge_after_seconds,
+    starts a duplicate and returns the first successful result.
+    """
+
+    if hedge_after_seconds is None:
+        return call()
+
+    executor = _get_hedge_executor()
+    primary = executor.submit(call)
+
+    done, _ = wait([primary], timeout=hedge_after_seconds)
+    if done:
+        return primary.result()
+
+    hedge = executor.submit(call)
+    pending = {primary, hedge}
+
+    while True:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+
+        # both failed → surface the primary's error
+        if not pending:
+            return primary.result()
 
 
 
@@ -50,76 +367,316 @@ def get_groq_response(
     model: str = DEFAULT_MODEL,
     temperature: float = 0.2,
     max_tokens: int = 800,
+    use_cache: Optional[bool] = None,
+    priority: int = PRIORITY_DEFAULT,
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
 ) -> str:
     """
-    Sends prompt to Groq LLM and returns safe response text.
-
-    Global error handling:
-    - Daily token limit exceeded
-    - Rate limiting
-    - Network failure
-    - Timeout
-    - Unexpected API crashes
+    Sends prompt to Groq LLM and returns the response text.
+
+    use_cache:
+        None  → cache only when temperature <= RESPONSE_CACHE_MAX_TEMPERATURE
+        False → always call the API (e.g. creative / varied output)
+        True  → always consult the cache
+
+    priority:
+        Position in the shared request scheduler queue
+        (PRIORITY_INTERACTIVE is served before PRIORITY_BACKGROUND).
+
+    Raises an LLMError subclass once retry_policy gives up:
+    - LLMQuotaExceededError  (daily token limit)
+    - LLMRateLimitError      (per-minute limits)
+    - LLMTimeoutError
+    - LLMTransportError      (network / 5xx)
+    - LLMConfigurationError  (missing API key)
     """
 
-    try:
-        client = get_groq_client()
+    messages = _build_messages(prompt)
 
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful educational assistant."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                },
-            ],
-            temperature=temperature,
-            max_tokens=max_tokens,
-        )
+    cache = _resolve_cache(use_cache, temperature)
+    cache_key = None
+
+    if cache is not None:
+        cache_key = cache.make_key(model, messages, temperature, max_tokens)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    client = get_groq_client()
+    scheduler = get_request_scheduler()
+    estimated_tokens = _estimate_request_tokens(messages, max_tokens)
+
+    def _attempt():
+        scheduler.acquire(estimated_tokens, priority)
+        response = None
+
+        try:
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+        except Exception as e:
+            raise classify_error(e) from e
+        finally:
+            scheduler.settle(
+                estimated_tokens,
+                _attempt_tokens(response, estimated_tokens, max_tokens),
+            )
 
         return response.choices[0].message.content.strip()
 
+    attempt = 0
 
-    # GROQ QUOTA / RATE LIMIT HANDLING
+    while True:
+        try:
+            text = _call_with_hedging(
+                _attempt, retry_policy.hedge_after_seconds
+            )
+            break
+        except LLMError as e:
+            if not retry_policy.should_retry(e, attempt):
+                raise
+            time.sleep(_back_off(retry_policy, e, attempt))
+            attempt += 1
 
+    if cache is not None:
+        cache.put(cache_key, text)
 
-    except Exception as e:
-        error_text = str(e).lower()
-
-        # Daily usage / quota exceeded
-        if (
-            "rate limit" in error_text
-            or "quota" in error_text
-            or "token" in error_text
-            or "maximum" in error_text
-            or "429" in error_text
-        ):
-            return (
-                "⚠️ Sorry, the Groq API maximum daily token usage has been reached. "
-                "Please try again later after 24 Hours to reset the limit."
+    return text
+
+
+
+# Streaming LLM call handler
+
+
+def stream_groq_response(
+    prompt: str,
+    model: str = DEFAULT_MODEL,
+    temperature: float = 0.2,
+    max_tokens: int = 800,
+    use_cache: Optional[bool] = None,
+    priority: int = PRIORITY_INTERACTIVE,
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+) -> Iterator[str]:
+    """
+    Streaming variant of get_groq_response.
+
+    Yields text deltas as the model produces them (suitable for
+    st.write_stream). Cached responses are yielded in one piece.
+    Failures before the first token are retried per retry_policy;
+    otherwise an LLMError is raised.
+    """
+
+    messages = _build_messages(prompt)
+
+    cache = _resolve_cache(use_cache, temperature)
+    cache_key = None
+
+    if cache is not None:
+        cache_key = cache.make_key(model, messages, temperature, max_tokens)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+    client = get_groq_client()
+    scheduler = get_request_scheduler()
+    estimated_tokens = _estimate_request_tokens(messages, max_tokens)
+
+    prompt_tokens = estimated_tokens - max_tokens
+
+    parts: List[str] = []
+    attempt = 0
+
+    while True:
+        scheduler.acquire(estimated_tokens, priority)
+        reported_tokens = None
+
+        try:
+            stream = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
             )
 
-        # Network / timeout issues
-        if (
-            "timeout" in error_text
-            or "connection" in error_text
-            or "network" in error_text
-            or "unreachable" in error_text
-        ):
-            return (
-                "⚠️ The AI service is temporarily unreachable. "
-                "Please check your internet connection and try again."
+            for chunk in stream:
+                reported_tokens = (
+                    _reported_stream_tokens(chunk) or reported_tokens
+                )
+
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+
+        except Exception as e:
+            error = classify_error(e)
+
+            # nothing shown yet → safe to retry
+            if parts or not retry_policy.should_retry(error, attempt):
+                raise error from e
+
+            time.sleep(_back_off(retry_policy, error, attempt))
+            attempt += 1
+            continue
+
+        finally:
+            # also runs when the consumer stops reading early; without
+            # reported usage, count ~4 characters per streamed token
+            scheduler.settle(
+                estimated_tokens,
+                reported_tokens
+                or prompt_tokens + sum(len(part) for part in parts) // 4,
             )
 
-        # Unknown failure (safe fallback)
-        return (
-            "⚠️ An unexpected error occurred while contacting the AI service. "
-            "Please try again later."
-        )
+        break
+
+    if cache is not None:
+        cache.put(cache_key, "".join(parts).strip())
+
+
+
+# Async LLM call handler
+
+
+def create_async_groq_client() -> AsyncGroq:
+    """
+    Builds an AsyncGroq client on a keep-alive connection pool.
+
+    Async connections belong to one event loop, so create one per
+    fan-out (asyncio.run) and close it afterwards.
+    """
+
+    http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            GROQ_TIMEOUT_SECONDS,
+            connect=GROQ_CONNECT_TIMEOUT_SECONDS,
+        ),
+        limits=httpx.Limits(
+            max_connections=GROQ_MAX_CONNECTIONS,
+            max_keepalive_connections=GROQ_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=GROQ_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+    # retries are handled by RetryPolicy, not the SDK
+    return AsyncGroq(
+        api_key=_resolve_api_key(),
+        base_url=GROQ_BASE_URL,
+        http_client=http_client,
+        max_retries=0,
+    )
+
+
+async def _acquire_async(
+    scheduler: RequestScheduler,
+    estimated_tokens: int,
+    priority: int,
+) -> None:
+    # the scheduler blocks, so wait for it off the event loop
+    acquiring = asyncio.ensure_future(
+        asyncio.to_thread(scheduler.acquire, estimated_tokens, priority)
+    )
+
+    try:
+        await asyncio.shield(acquiring)
+    except asyncio.CancelledError:
+        # the worker thread cannot be interrupted; once it gets its
+        # slot, hand the unused token reservation back
+        def _release(future):
+            if not future.cancelled() and future.exception() is None:
+                scheduler.settle(estimated_tokens, 0)
+
+        acquiring.add_done_callback(_release)
+        raise
+
+
+async def get_groq_response_async(
+    prompt: str,
+    model: str = DEFAULT_MODEL,
+    temperature: float = 0.2,
+    max_tokens: int = 800,
+    use_cache: Optional[bool] = None,
+    client: Optional[AsyncGroq] = None,
+    priority: int = PRIORITY_DEFAULT,
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    timeout: Optional[float] = None,
+) -> str:
+    """
+    asyncio variant of get_groq_response (same errors and retries;
+    hedging is not applied).
+
+    timeout limits each HTTP request (not scheduler queueing or
+    retry back-off); an expired request raises LLMTimeoutError and
+    is retried per retry_policy.
+    """
+
+    messages = _build_messages(prompt)
+
+    cache = _resolve_cache(use_cache, temperature)
+    cache_key = None
+
+    if cache is not None:
+        cache_key = cache.make_key(model, messages, temperature, max_tokens)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    scheduler = get_request_scheduler()
+    estimated_tokens = _estimate_request_tokens(messages, max_tokens)
+
+    owns_client = client is None
+    if owns_client:
+        client = create_async_groq_client()
+
+    try:
+        attempt = 0
+
+        while True:
+            await _acquire_async(scheduler, estimated_tokens, priority)
+
+            response = None
+
+            try:
+                response = await client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    # None would disable the client timeout altogether
+                    **({"timeout": timeout} if timeout is not None else {}),
+                )
+            except Exception as e:
+                error, cause = classify_error(e), e
+            finally:
+                scheduler.settle(
+                    estimated_tokens,
+                    _attempt_tokens(response, estimated_tokens, max_tokens),
+                )
+
+            if response is not None:
+                break
+
+            if not retry_policy.should_retry(error, attempt):
+                raise error from cause
+
+            await asyncio.sleep(_back_off(retry_policy, error, attempt))
+            attempt += 1
+
+    finally:
+        if owns_client:
+            await client.close()
+
+    text = response.choices[0].message.content.strip()
+
+    if cache is not None:
+        cache.put(cache_key, text)
+
+    return text
 
 
 
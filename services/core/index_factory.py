@@ -0,0 +1,340 @@
+# pylint: disable=E1120
+
+import math
+import os
+from typing import Optional
+
+import faiss
+import numpy as np
+
+
+# Configuration
+
+
+INDEX_TYPES = ("auto", "flat", "ivf", "hnsw", "ivfpq")
+
+DEFAULT_INDEX_TYPE = os.getenv("VECTORSTORE_INDEX_TYPE", "auto").lower()
+
+# per-dimension vector storage (IVF-PQ always uses its own PQ codes)
+STORAGE_TYPES = ("float32", "float16", "int8")
+
+DEFAULT_STORAGE = os.getenv("VECTORSTORE_STORAGE", "float32").lower()
+
+_SCALAR_QUANTIZERS = {
+    "float16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+# auto mode: corpus size at which we move off brute force
+IVF_MIN_VECTORS = 50_000
+IVFPQ_MIN_VECTORS = 1_000_000
+
+# below this a trained index is not worth it (or cannot be trained)
+MIN_TRAINING_VECTORS = 10_000
+
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+HNSW_EF_SEARCH = 64
+
+IVF_NPROBE = 16
+PQ_SUBVECTOR_BITS = 8
+PQ_BYTES_PER_VECTOR = 48
+
+
+
+# Index selection
+
+
+def resolve_index_type(index_type: Optional[str], num_vectors: int) -> str:
+    """
+    Maps a configured index type (or "auto") to a concrete backend.
+
+    Small corpora always stay on the exact flat index.
+    """
+
+    index_type = (index_type or DEFAULT_INDEX_TYPE).lower()
+
+    if index_type not in INDEX_TYPES:
+        raise ValueError(
+            f"Unknown index type '{index_type}'. "
+            f"Expected one of: {', '.join(INDEX_TYPES)}"
+        )
+
+    if num_vectors < MIN_TRAINING_VECTORS:
+        return "flat"
+
+    if index_type != "auto":
+        return index_type
+
+    if num_vectors >= IVFPQ_MIN_VECTORS:
+        return "ivfpq"
+
+    if num_vectors >= IVF_MIN_VECTORS:
+        return "ivf"
+
+    return "flat"
+
+
+def resolve_storage(storage: Optional[str]) -> str:
+    storage = (storage or DEFAULT_STORAGE).lower()
+
+    if storage not in STORAGE_TYPES:
+        raise ValueError(
+            f"Unknown storage type '{storage}'. "
+            f"Expected one of: {', '.join(STORAGE_TYPES)}"
+        )
+
+    return storage
+
+
+def index_storage(index) -> str:
+    """
+    Returns how an existing index stores vectors ("float32" also
+    covers IVF-PQ, which has its own compression).
+    """
+
+    if isinstance(index, faiss.IndexHNSW):
+        index = faiss.downcast_index(index.storage)
+
+    sq = getattr(index, "sq", None)
+    if sq is None:
+        return "float32"
+
+    if sq.qtype == faiss.ScalarQuantizer.QT_fp16:
+        return "float16"
+    return "int8"
+
+
+def index_kind(index) -> str:
+    """
+    Returns the backend name of an existing FAISS index.
+    """
+
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "ivfpq"
+    if isinstance(index, faiss.IndexIVF):
+        return "ivf"
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    return "flat"
+
+
+
+# Index construction
+
+
+def _num_lists(num_vectors: int) -> int:
+    # ~4·sqrt(n) centroids, each trained on ≥ 39 points
+    return max(1, min(int(4 * math.sqrt(num_vectors)), num_vectors // 39))
+
+
+def _pq_subquantizers(dimension: int) -> int:
+    m = min(PQ_BYTES_PER_VECTOR, dimension)
+    while dimension % m:
+        m -= 1
+    return m
+
+
+def _train(index, training_vectors: Optional[np.ndarray]):
+    if index.is_trained:
+        return index
+
+    if training_vectors is None:
+        raise ValueError("int8 storage requires training vectors.")
+
+    index.train(training_vectors)
+    return index
+
+
+def create_index(
+    index_type: str,
+    dimension: int,
+    training_vectors: Optional[np.ndarray] = None,
+    storage: str = "float32",
+):
+    """
+    Builds an empty (trained where required) inner-product index.
+
+    training_vectors must be provided for "ivf", "ivfpq" and for
+    int8 storage (per-dimension value ranges). float16 / int8
+    storage scalar-quantizes the flat, IVF and HNSW backends.
+    """
+
+    qtype = _SCALAR_QUANTIZERS.get(storage)
+
+    if index_type == "flat":
+        if qtype is None:
+            return faiss.IndexFlatIP(dimension)
+
+        index = faiss.IndexScalarQuantizer(
+            dimension, qtype, faiss.METRIC_INNER_PRODUCT
+        )
+        return _train(index, training_vectors)
+
+    if index_type == "hnsw":
+        if qtype is None:
+            index = faiss.IndexHNSWFlat(
+                dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT
+            )
+        else:
+            index = faiss.IndexHNSWSQ(
+                dimension, qtype, HNSW_M, faiss.METRIC_INNER_PRODUCT
+            )
+            _train(index, training_vectors)
+
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+        return index
+
+    if training_vectors is None:
+        raise ValueError(f"Index type '{index_type}' requires training vectors.")
+
+    nlist = _num_lists(len(training_vectors))
+    quantizer = faiss.IndexFlatIP(dimension)
+
+    if index_type == "ivf" and qtype is not None:
+        index = faiss.IndexIVFScalarQuantizer(
+            quantizer, dimension, nlist, qtype, faiss.METRIC_INNER_PRODUCT
+        )
+    elif index_type == "ivf":
+        index = faiss.IndexIVFFlat(
+            quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT
+        )
+    elif index_type == "ivfpq":
+        index = faiss.IndexIVFPQ(
+            quantizer,
+            dimension,
+            nlist,
+            _pq_subquantizers(dimension),
+            PQ_SUBVECTOR_BITS,
+            faiss.METRIC_INNER_PRODUCT,
+        )
+    else:
+        raise ValueError(f"Unknown index type '{index_type}'.")
+
+    index.train(training_vectors)
+    index.nprobe = min(IVF_NPROBE, nlist)
+
+    # id → vector lookups (reconstruct) for MMR re-ranking
+    index.make_direct_map()
+
+    return index
+
+
+def build_index(
+    index_type: str,
+    vectors: np.ndarray,
+    storage: str = "float32",
+):
+    """
+    Creates an index of index_type and adds vectors to it.
+    """
+
+    index = create_index(
+        index_type,
+        vectors.shape[1],
+        training_vectors=vectors,
+        storage=storage,
+    )
+    index.add(vectors)
+    return index
+
+
+
+# Filtered search
+
+
+def search_parameters(index, selector):
+    """
+    SearchParameters restricting index.search to selector's ids.
+
+    The parameter class must match the backend (IVF / HNSW read their
+    own probe settings from it), so the current ones are carried over.
+    """
+
+    kind = index_kind(index)
+
+    if kind in ("ivf", "ivfpq"):
+        return faiss.SearchParametersIVF(sel=selector, nprobe=index.nprobe)
+
+    if kind == "hnsw":
+        return faiss.SearchParametersHNSW(
+            sel=selector, efSearch=index.hnsw.efSearch
+        )
+
+    return faiss.SearchParameters(sel=selector)
+
+
+
+# Memory-mapped flat index
+
+
+class MappedFlatIndex:
+    """
+    Read-only exact inner-product index over a memory-mapped (n, d)
+    float32 array.
+
+    FAISS reads IndexFlat fully into memory even with IO_FLAG_MMAP,
+    so saved flat stores keep their vectors as .npy and are searched
+    here instead; the pages live in the shared page cache. Mirrors
+    the parts of the FAISS index API VectorStoreService uses for
+    searching; it is swapped for a faiss.IndexFlatIP before any
+    modification.
+    """
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = vectors
+        self.d = vectors.shape[1]
+
+    @property
+    def ntotal(self) -> int:
+        return len(self.vectors)
+
+    def search(
+        self,
+        x: np.ndarray,
+        k: int,
+        allowed_ids: Optional[np.ndarray] = None,
+        excluded_ids: Optional[np.ndarray] = None,
+    ):
+        """
+        Returns (scores, ids) of shape (len(x), k), FAISS-style:
+        missing results are padded with id -1.
+        """
+
+        ids = None
+        if allowed_ids is not None:
+            # sorted ids → sequential reads from the mapping
+            ids = np.sort(allowed_ids)
+            scores = x @ self.vectors[ids].T
+        else:
+            scores = x @ self.vectors.T
+            if excluded_ids is not None:
+                scores[:, excluded_ids] = -np.inf
+
+        found = min(k, scores.shape[1])
+
+        indices = np.full((len(x), k), -1, dtype=np.int64)
+        distances = np.full((len(x), k), -np.inf, dtype=np.float32)
+
+        if found == 0:
+            return distances, indices
+
+        top = np.argpartition(-scores, found - 1, axis=1)[:, :found]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        indices[:, :found] = ids[top] if ids is not None else top
+        distances[:, :found] = top_scores
+        indices[np.isinf(distances)] = -1
+
+        return distances, indices
+
+    def reconstruct_batch(self, ids: np.ndarray) -> np.ndarray:
+        return np.asarray(self.vectors[ids], dtype=np.float32)
+
+    def reconstruct_n(self, start: int, count: int) -> np.ndarray:
+        return np.array(self.vectors[start:start + count], dtype=np.float32)
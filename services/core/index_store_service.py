@@ -0,0 +1,129 @@
+import contextlib
+import os
+import shutil
+import threading
+import time
+from typing import Optional
+
+from services.core.vectorstore_service import VectorStoreService
+
+
+# Configuration
+
+
+DEFAULT_INDEX_CACHE_DIR = os.getenv(
+    "INDEX_CACHE_DIR",
+    os.path.join(".cache", "indexes"),
+)
+
+DEFAULT_INDEX_CACHE_MAX_BYTES = int(
+    os.getenv("INDEX_CACHE_MAX_MB", "1024")
+) * 1024 * 1024
+
+
+
+# Disk-backed index store
+
+
+class IndexStoreService:
+    """
+    Persists FAISS vector stores on disk keyed by PDF content hash.
+
+    Layout:
+        <root>/<file_hash>/index.faiss   (flat.npy for flat stores)
+        <root>/<file_hash>/documents.json
+
+    Entry mtime is used as the LRU clock; the least recently used
+    entries are evicted once the directory exceeds max_bytes.
+    """
+
+    def __init__(
+        self,
+        root_dir: str = DEFAULT_INDEX_CACHE_DIR,
+        max_bytes: int = DEFAULT_INDEX_CACHE_MAX_BYTES,
+    ):
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def _entry_dir(self, file_hash: str) -> str:
+        return os.path.join(self.root_dir, file_hash)
+
+
+    # Read
+
+    def get(self, file_hash: str) -> Optional[VectorStoreService]:
+        entry_dir = self._entry_dir(file_hash)
+
+        if not os.path.isdir(entry_dir):
+            return None
+
+        try:
+            store = VectorStoreService.load(entry_dir, mmap=True)
+        except (OSError, ValueError, KeyError, RuntimeError):
+            # partial or corrupt entry → drop it and rebuild
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+        store.file_hash = file_hash
+
+        # mark as recently used (unless another process evicted it
+        # meanwhile; the loaded store is still valid)
+        now = time.time()
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(entry_dir, (now, now))
+
+        return store
+
+
+    # Write
+
+    def put(self, file_hash: str, vectorstore: VectorStoreService) -> None:
+        entry_dir = self._entry_dir(file_hash)
+        tmp_dir = f"{entry_dir}.tmp-{os.getpid()}-{threading.get_ident()}"
+
+        vectorstore.save(tmp_dir)
+
+        with self._lock:
+            if os.path.isdir(entry_dir):
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            else:
+                os.replace(tmp_dir, entry_dir)
+
+            self._evict()
+
+
+    # LRU eviction
+
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        total = 0
+        for name in os.listdir(path):
+            try:
+                total += os.path.getsize(os.path.join(path, name))
+            except OSError:
+                continue
+        return total
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+
+        for name in os.listdir(self.root_dir):
+            path = os.path.join(self.root_dir, name)
+            if not os.path.isdir(path) or ".tmp-" in name:
+                continue
+
+            size = self._dir_size(path)
+            entries.append((os.path.getmtime(path), size, path))
+            total += size
+
+        entries.sort()
+
+        # oldest first; always keep the newest entry
+        while total > self.max_bytes and len(entries) > 1:
+            _, size, path = entries.pop(0)
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
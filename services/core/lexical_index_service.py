@@ -0,0 +1,331 @@
+import math
+import re
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Configuration
+
+
+# standard Okapi BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# reciprocal rank fusion constant (Cormack et al.)
+RRF_K = 60
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+_STOPWORDS = frozenset(
+    """
+    a an and are as at be but by can do does for from how in is it its
+    of on or that the their there these this to was were what when where
+    which who why will with
+    """.split()
+)
+
+# term frequencies are stored as uint16
+_MAX_TERM_FREQUENCY = 65535
+
+# longer "words" are run-on text from PDF extraction, not terms
+MAX_TOKEN_LENGTH = 64
+
+
+
+# Tokenization
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lower-cased word tokens without stopwords.
+
+    Acronyms and formula names (ATP, H2O, CO2) survive as single
+    tokens, which is what dense retrieval tends to miss. Tokens longer
+    than MAX_TOKEN_LENGTH (text whose spaces were lost in extraction)
+    are dropped.
+    """
+
+    return [
+        token
+        for token in _TOKEN_PATTERN.findall(text.lower())
+        if len(token) <= MAX_TOKEN_LENGTH and token not in _STOPWORDS
+    ]
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[int]],
+    top_k: int,
+    k: int = RRF_K,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fuses several best-first id lists: score(id) = Σ 1 / (k + rank).
+
+    Returns (ids, fused scores), best first.
+    """
+
+    fused: Dict[int, float] = {}
+
+    for ranking in rankings:
+        for rank, chunk_id in enumerate(ranking, start=1):
+            chunk_id = int(chunk_id)
+            fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (k + rank)
+
+    best = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+    return (
+        np.array([chunk_id for chunk_id, _ in best], dtype=np.int64),
+        np.array([score for _, score in best], dtype=np.float32),
+    )
+
+
+
+# BM25 inverted index
+
+
+class BM25Index:
+    """
+    BM25 inverted index over chunk texts.
+
+    Chunks are only appended; removed ones are dropped in bulk by
+    compact().
+
+    Chunk ids are assigned in insertion order, so they line up with
+    the FAISS ids of the owning VectorStoreService. Each term's
+    postings are two typed arrays (int32 chunk ids, uint16 term
+    frequencies) rather than Python lists of tuples.
+
+    Not thread-safe on its own; VectorStoreService guards it.
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+
+        self._vocabulary: Dict[str, int] = {}
+        self._postings: List[array] = []
+        self._frequencies: List[array] = []
+
+        self._doc_lengths = array("I")
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+
+    # Build
+
+    def add(self, token_lists: Iterable[List[str]]) -> None:
+        """
+        Appends chunks given as token lists (see tokenize()).
+        """
+
+        for tokens in token_lists:
+            chunk_id = len(self._doc_lengths)
+
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+
+            for term, count in counts.items():
+                term_id = self._vocabulary.get(term)
+
+                if term_id is None:
+                    term_id = len(self._postings)
+                    self._vocabulary[term] = term_id
+                    self._postings.append(array("i"))
+                    self._frequencies.append(array("H"))
+
+                self._postings[term_id].append(chunk_id)
+                self._frequencies[term_id].append(
+                    min(count, _MAX_TERM_FREQUENCY)
+                )
+
+            self._doc_lengths.append(len(tokens))
+            self._total_length += len(tokens)
+
+
+    # Search
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 4,
+        allowed_ids: Optional[np.ndarray] = None,
+        excluded_ids: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (chunk ids, BM25 scores), best first.
+
+        Only chunks containing at least one query term are returned;
+        allowed_ids restricts results to those chunk ids and
+        excluded_ids drops those (e.g. removed, not yet compacted).
+        """
+
+        num_docs = len(self._doc_lengths)
+
+        term_ids = {
+            self._vocabulary[term]
+            for term in tokenize(query)
+            if term in self._vocabulary
+        }
+
+        if num_docs == 0 or not term_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        lengths = np.frombuffer(self._doc_lengths, dtype=np.uint32)
+        length_norm = self.k1 * (
+            1 - self.b + self.b * lengths / (self._total_length / num_docs)
+        )
+
+        scores = np.zeros(num_docs, dtype=np.float32)
+
+        for term_id in term_ids:
+            ids = np.frombuffer(self._postings[term_id], dtype=np.int32)
+            tfs = np.frombuffer(
+                self._frequencies[term_id], dtype=np.uint16
+            ).astype(np.float32)
+
+            df = len(ids)
+            idf = math.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+
+            # each chunk appears at most once per term
+            scores[ids] += idf * tfs * (self.k1 + 1) / (tfs + length_norm[ids])
+
+        if allowed_ids is not None:
+            mask = np.zeros(num_docs, dtype=bool)
+            mask[allowed_ids] = True
+            scores[~mask] = 0.0
+
+        if excluded_ids is not None:
+            scores[excluded_ids] = 0.0
+
+        candidates = np.flatnonzero(scores)
+
+        if len(candidates) > top_k:
+            candidates = candidates[
+                np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+            ]
+
+        order = candidates[np.argsort(-scores[candidates])]
+
+        return order.astype(np.int64), scores[order]
+
+
+    # Compaction
+
+    def compact(self, keep: np.ndarray) -> None:
+        """
+        Drops chunks where keep is False and renumbers the rest in
+        order, remapping postings without re-tokenizing.
+        """
+
+        remap = (np.cumsum(keep) - 1).astype(np.int32)
+        lengths = np.frombuffer(self._doc_lengths, dtype=np.uint32)[keep]
+
+        vocabulary: Dict[str, int] = {}
+        postings: List[array] = []
+        frequencies: List[array] = []
+
+        for term, term_id in self._vocabulary.items():
+            ids = np.frombuffer(self._postings[term_id], dtype=np.int32)
+            live = keep[ids]
+
+            if not live.any():
+                continue
+
+            tfs = np.frombuffer(self._frequencies[term_id], dtype=np.uint16)
+
+            vocabulary[term] = len(postings)
+            postings.append(array("i", remap[ids[live]].tobytes()))
+            frequencies.append(array("H", tfs[live].tobytes()))
+
+        self._vocabulary = vocabulary
+        self._postings = postings
+        self._frequencies = frequencies
+
+        self._doc_lengths = array("I", lengths.tobytes())
+        self._total_length = int(lengths.sum())
+
+
+    # Memory accounting
+
+    def nbytes(self) -> int:
+        postings = sum(
+            p.buffer_info()[1] * p.itemsize for p in self._postings
+        )
+        frequencies = sum(
+            f.buffer_info()[1] * f.itemsize for f in self._frequencies
+        )
+        lengths = len(self._doc_lengths) * self._doc_lengths.itemsize
+
+        return postings + frequencies + lengths
+
+
+    # Persistence
+
+    def save(self, path: str) -> None:
+        """
+        Writes the index as flat CSR arrays (.npz).
+
+        Terms are stored as one UTF-8 blob plus offsets; a fixed-width
+        string array would pad every term to the longest one.
+        """
+
+        terms = sorted(self._vocabulary, key=self._vocabulary.get)
+        encoded = [term.encode("utf-8") for term in terms]
+
+        term_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        term_offsets[1:] = np.cumsum([len(term) for term in encoded])
+
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(p) for p in self._postings])
+
+        def _concat(arrays: List[array], dtype) -> np.ndarray:
+            if not arrays:
+                return np.empty(0, dtype=dtype)
+            return np.concatenate(
+                [np.frombuffer(a, dtype=dtype) for a in arrays]
+            )
+
+        np.savez(
+            path,
+            terms=np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            term_offsets=term_offsets,
+            offsets=offsets,
+            postings=_concat(self._postings, np.int32),
+            frequencies=_concat(self._frequencies, np.uint16),
+            doc_lengths=np.frombuffer(self._doc_lengths, dtype=np.uint32),
+            params=np.array([self.k1, self.b]),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with np.load(path) as data:
+            k1, b = data["params"].tolist()
+            index = cls(k1=k1, b=b)
+
+            offsets = data["offsets"]
+            postings = data["postings"]
+            frequencies = data["frequencies"]
+
+            blob = data["terms"].tobytes()
+            term_offsets = data["term_offsets"].tolist()
+
+            for term_id in range(len(term_offsets) - 1):
+                start, end = offsets[term_id], offsets[term_id + 1]
+                term = blob[
+                    term_offsets[term_id]:term_offsets[term_id + 1]
+                ].decode("utf-8")
+
+                index._vocabulary[term] = term_id
+                index._postings.append(array("i", postings[start:end].tobytes()))
+                index._frequencies.append(
+                    array("H", frequencies[start:end].tobytes())
+                )
+
+            index._doc_lengths = array("I", data["doc_lengths"].tobytes())
+            index._total_length = int(data["doc_lengths"].sum())
+
+        return index
@@ -0,0 +1,118 @@
+from typing import Optional
+
+import httpx
+from groq import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    RateLimitError,
+)
+
+
+# Error types
+
+
+class LLMError(Exception):
+    """
+    Base class for failed LLM calls.
+
+    user_message is safe to show in the UI; retryable tells the
+    retry policy whether another attempt can succeed.
+    """
+
+    user_message = (
+        "An unexpected error occurred while contacting the AI service. "
+        "Please try again later."
+    )
+    retryable = False
+
+
+class LLMRateLimitError(LLMError):
+    user_message = (
+        "The AI service is busy right now. "
+        "Please wait a moment and try again."
+    )
+    retryable = True
+
+    def __init__(self, message: str = "", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMQuotaExceededError(LLMError):
+    user_message = (
+        "Sorry, the Groq API maximum daily token usage has been reached. "
+        "Please try again later after 24 Hours to reset the limit."
+    )
+
+
+class LLMTimeoutError(LLMError):
+    user_message = (
+        "The AI service took too long to respond. "
+        "Please try again."
+    )
+    retryable = True
+
+
+class LLMTransportError(LLMError):
+    user_message = (
+        "The AI service is temporarily unreachable. "
+        "Please check your internet connection and try again."
+    )
+    retryable = True
+
+
+class LLMConfigurationError(LLMError):
+    user_message = (
+        "Groq API key not found. "
+        "Add GROQ_API_KEY to Streamlit Secrets or .env file."
+    )
+
+
+
+# Exception classification
+
+
+# Groq reports daily limits as 429s mentioning the per-day budget
+_QUOTA_MARKERS = ("per day", "tokens per day", "requests per day", "tpd", "rpd", "quota")
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+
+    value = response.headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def classify_error(error: Exception) -> LLMError:
+    """
+    Maps a Groq SDK / httpx exception onto an LLMError subclass.
+    """
+
+    if isinstance(error, LLMError):
+        return error
+
+    message = str(error)
+    status_code = getattr(error, "status_code", None)
+
+    if isinstance(error, RateLimitError) or status_code == 429:
+        if any(marker in message.lower() for marker in _QUOTA_MARKERS):
+            return LLMQuotaExceededError(message)
+        return LLMRateLimitError(message, retry_after=_retry_after(error))
+
+    # APITimeoutError subclasses APIConnectionError → check it first
+    if isinstance(error, (APITimeoutError, httpx.TimeoutException)):
+        return LLMTimeoutError(message)
+
+    if isinstance(error, (APIConnectionError, httpx.TransportError)):
+        return LLMTransportError(message)
+
+    if isinstance(error, APIStatusError) and status_code and status_code >= 500:
+        return LLMTransportError(message)
+
+    return LLMError(message)
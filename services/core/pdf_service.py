@@ -1,29 +1,141 @@
-
-from typing import List
-from langchain_community.document_loaders import PyPDFLoader
+from typing import Iterable, Iterator, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import io
+import os
+from pypdf import PdfReader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain.schema import Document
-import tempfile
-import os
 
 
-def load_pdf_documents(pdf_file) -> List[Document]:
+# Parallel extraction settings
+
+PDF_EXTRACTION_WORKERS = int(
+    os.getenv("PDF_EXTRACTION_WORKERS", str(os.cpu_count() or 1))
+)
+
+# below this page count the pool start-up costs more than it saves
+PARALLEL_PAGE_THRESHOLD = 48
+
+
+# per-worker reader, parsed once by _init_worker
+_worker_reader: Optional[PdfReader] = None
+
+
+def _init_worker(pdf_bytes: bytes) -> None:
+    """
+    Worker initializer: receives the PDF once per process.
+    """
+
+    global _worker_reader
+    _worker_reader = PdfReader(io.BytesIO(pdf_bytes))
+
+
+def _extract_page_range(start: int, end: int) -> List[str]:
+    """
+    Worker: extracts text for pages [start, end).
+    """
+
+    return [
+        _worker_reader.pages[i].extract_text()
+        for i in range(start, end)
+    ]
+
+
+def _page_ranges(num_pages: int, workers: int) -> List[tuple]:
+    # a few ranges per worker keeps the pool busy when pages vary in cost
+    num_ranges = min(num_pages, workers * 4)
+    step = -(-num_pages // num_ranges)
+
+    return [
+        (start, min(start + step, num_pages))
+        for start in range(0, num_pages, step)
+    ]
+
+
+def count_pdf_pages(pdf_file) -> int:
+    pdf_file.seek(0)
+    return len(PdfReader(pdf_file).pages)
+
+
+def iter_pdf_documents(
+    pdf_file,
+    workers: Optional[int] = None,
+) -> Iterator[Document]:
+    """
+    Yields one LangChain Document per page, in page order.
+
+    Parses straight from the uploaded in-memory buffer; the
+    metadata matches PyPDFLoader ("source", 0-based "page").
+
+    Large PDFs are split into page ranges and extracted in a
+    process pool (workers defaults to PDF_EXTRACTION_WORKERS;
+    workers=1 forces serial extraction).
+    """
+
+    workers = workers or PDF_EXTRACTION_WORKERS
+
+    pdf_file.seek(0)
+    reader = PdfReader(pdf_file)
+    num_pages = len(reader.pages)
+
+    source = getattr(pdf_file, "name", "uploaded.pdf")
+
+    if workers > 1 and num_pages >= PARALLEL_PAGE_THRESHOLD:
+        pdf_bytes = pdf_file.getvalue()
+        ranges = _page_ranges(num_pages, workers)
+
+        # spawn, not fork: this runs from ingest threads in a process
+        # that already has torch threads running
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(pdf_bytes,),
+        ) as pool:
+            # map() yields in submission order → pages stay in order
+            results = pool.map(
+                _extract_page_range,
+                [start for start, _ in ranges],
+                [end for _, end in ranges],
+            )
+
+            for (start, _), texts in zip(ranges, results):
+                for offset, text in enumerate(texts):
+                    yield Document(
+                        page_content=text,
+                        metadata={"source": source, "page": start + offset},
+                    )
+        return
+
+    for page_number, page in enumerate(reader.pages):
+        yield Document(
+            page_content=page.extract_text(),
+            metadata={"source": source, "page": page_number},
+        )
+
+
+def load_pdf_documents(
+    pdf_file,
+    workers: Optional[int] = None,
+) -> List[Document]:
     """
     Loads PDF and returns LangChain Document objects
     with page-level metadata.
     """
 
-    # Streamlit uploads file in memory → LangChain needs file path
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        tmp_file.write(pdf_file.read())
-        tmp_path = tmp_file.name
+    return list(iter_pdf_documents(pdf_file, workers=workers))
 
-    loader = PyPDFLoader(tmp_path)
-    documents = loader.load()
 
-    os.remove(tmp_path)
-
-    return documents
+def _build_splitter(
+    chunk_size: int,
+    chunk_overlap: int,
+) -> RecursiveCharacterTextSplitter:
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n\n", "\n", ".", " ", ""],
+    )
 
 
 def chunk_pdf_documents(
@@ -35,17 +147,31 @@ def chunk_pdf_documents(
     Splits PDF documents into chunks while preserving metadata.
     """
 
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        separators=["\n\n", "\n", ".", " ", ""],
-    )
+    splitter = _build_splitter(chunk_size, chunk_overlap)
 
     chunks = splitter.split_documents(documents)
 
     return chunks
 
 
+def iter_pdf_chunks(
+    documents: Iterable[Document],
+    chunk_size: int = 800,
+    chunk_overlap: int = 100,
+) -> Iterator[Document]:
+    """
+    Streaming variant of chunk_pdf_documents.
+
+    Pages are split as they arrive, producing the same chunks
+    (each page is split independently either way).
+    """
+
+    splitter = _build_splitter(chunk_size, chunk_overlap)
+
+    for document in documents:
+        yield from splitter.split_documents([document])
+
+
 def process_pdf(
     pdf_file,
     chunk_size: int = 800,
@@ -0,0 +1,189 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from typing import Dict
+
+
+# Configuration
+
+
+DEFAULT_REQUESTS_PER_MINUTE = int(os.getenv("GROQ_RPM_LIMIT", "30"))
+DEFAULT_TOKENS_PER_MINUTE = int(os.getenv("GROQ_TPM_LIMIT", "12000"))
+
+# lower value = served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 1
+PRIORITY_BACKGROUND = 2
+
+
+
+# Token bucket
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at rate_per_second.
+
+    Not thread-safe on its own; RequestScheduler guards it.
+    """
+
+    def __init__(self, capacity: float, rate_per_second: float):
+        self.capacity = capacity
+        self.rate_per_second = rate_per_second
+        self.level = capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(
+            self.capacity,
+            self.level + (now - self._updated_at) * self.rate_per_second,
+        )
+        self._updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """
+        Seconds until amount can be taken (0 if available now).
+        """
+
+        self._refill()
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate_per_second
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount
+
+    def give_back(self, amount: float) -> None:
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+
+# Request scheduler
+
+
+class RequestScheduler:
+    """
+    Shared in-process gate in front of the Groq API.
+
+    Callers acquire a slot against requests-per-minute and
+    tokens-per-minute budgets. Waiting callers are served strictly
+    by priority, then arrival order, so interactive chat jumps ahead
+    of background summarization.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE,
+    ):
+        self._requests = TokenBucket(
+            requests_per_minute, requests_per_minute / 60.0
+        )
+        self._tokens = TokenBucket(
+            tokens_per_minute, tokens_per_minute / 60.0
+        )
+
+        self._cond = threading.Condition()
+        self._queue = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+
+        # metrics
+        self._granted = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _wait_time(self, tokens: float) -> float:
+        return max(
+            self._paused_until - time.monotonic(),
+            self._requests.wait_time(1),
+            self._tokens.wait_time(tokens),
+        )
+
+    def acquire(self, estimated_tokens: int, priority: int = PRIORITY_DEFAULT) -> float:
+        """
+        Blocks until the call may proceed; returns seconds waited.
+
+        estimated_tokens should cover prompt + max output; settle()
+        corrects the token budget once real usage is known.
+        """
+
+        tokens = min(estimated_tokens, self._tokens.capacity)
+        ticket = (priority, next(self._sequence))
+        start = time.monotonic()
+
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+
+            try:
+                while True:
+                    if self._queue[0] == ticket:
+                        wait = self._wait_time(tokens)
+                        if wait <= 0:
+                            break
+                        self._cond.wait(timeout=wait)
+                    else:
+                        self._cond.wait()
+            except BaseException:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+                raise
+
+            heapq.heappop(self._queue)
+            self._requests.take(1)
+            self._tokens.take(tokens)
+
+            waited = time.monotonic() - start
+            self._granted += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+            # let the next caller in line check its budget
+            self._cond.notify_all()
+
+        return waited
+
+    def settle(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """
+        Refunds (or charges) the difference between the reserved
+        and the reported token usage.
+        """
+
+        estimated_tokens = min(estimated_tokens, self._tokens.capacity)
+
+        with self._cond:
+            if actual_tokens < estimated_tokens:
+                self._tokens.give_back(estimated_tokens - actual_tokens)
+            else:
+                self._tokens.take(actual_tokens - estimated_tokens)
+            self._cond.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """
+        Holds every caller back, e.g. after the API returned 429.
+        """
+
+        with self._cond:
+            self._paused_until = max(
+                self._paused_until, time.monotonic() + seconds
+            )
+
+
+    # Metrics
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            return {
+                "queue_depth": len(self._queue),
+                "granted": self._granted,
+                "avg_wait_seconds": (
+                    self._total_wait / self._granted if self._granted else 0.0
+                ),
+                "max_wait_seconds": self._max_wait,
+            }
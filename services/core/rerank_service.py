@@ -0,0 +1,168 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain.schema import Document
+from sentence_transformers import CrossEncoder
+
+from services.core.lexical_index_service import tokenize
+
+
+# Configuration
+
+
+RERANK_ENABLED = os.getenv("RAG_RERANK", "0") == "1"
+
+DEFAULT_RERANK_MODEL = os.getenv(
+    "RERANK_MODEL",
+    "cross-encoder/ms-marco-MiniLM-L-6-v2",
+)
+
+# keyword-overlap scorer, no model download (tests / CI)
+STUB_RERANK_MODEL = "stub"
+
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "32"))
+
+# concurrent rerank calls per process; each already uses all torch
+# intra-op threads, so more would only oversubscribe the CPU
+RERANK_MAX_CONCURRENCY = int(os.getenv("RERANK_MAX_CONCURRENCY", "2"))
+
+
+
+# Stub scorer
+
+
+class StubCrossEncoder:
+    """
+    CrossEncoder stand-in scoring (query, passage) pairs by the
+    fraction of query terms found in the passage.
+    """
+
+    def predict(
+        self,
+        sentences: Sequence[Tuple[str, str]],
+        batch_size: int = RERANK_BATCH_SIZE,
+        show_progress_bar: bool = False,
+    ) -> np.ndarray:
+
+        scores = []
+
+        for query, passage in sentences:
+            query_terms = set(tokenize(query))
+            passage_terms = set(tokenize(passage))
+
+            scores.append(
+                len(query_terms & passage_terms) / len(query_terms)
+                if query_terms
+                else 0.0
+            )
+
+        return np.asarray(scores, dtype=np.float32)
+
+
+
+# Process-wide model registry
+
+
+_MODEL_REGISTRY: Dict[str, object] = {}
+_MODEL_LOAD_SECONDS: Dict[str, float] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+_RERANK_SLOTS = threading.BoundedSemaphore(RERANK_MAX_CONCURRENCY)
+
+
+def get_rerank_model(model_name: str = DEFAULT_RERANK_MODEL):
+    """
+    Returns the shared cross-encoder for model_name (loaded once
+    per process); STUB_RERANK_MODEL returns a StubCrossEncoder.
+    """
+
+    model = _MODEL_REGISTRY.get(model_name)
+    if model is not None:
+        return model
+
+    with _REGISTRY_LOCK:
+        model = _MODEL_REGISTRY.get(model_name)
+        if model is None:
+            start = time.perf_counter()
+
+            if model_name == STUB_RERANK_MODEL:
+                model = StubCrossEncoder()
+            else:
+                model = CrossEncoder(model_name, device="cpu")
+
+            _MODEL_LOAD_SECONDS[model_name] = time.perf_counter() - start
+            _MODEL_REGISTRY[model_name] = model
+
+    return model
+
+
+def get_rerank_model_load_time(
+    model_name: str = DEFAULT_RERANK_MODEL,
+) -> Optional[float]:
+    return _MODEL_LOAD_SECONDS.get(model_name)
+
+
+def warm_up_rerank_model(
+    model_name: str = DEFAULT_RERANK_MODEL,
+    background: bool = False,
+) -> None:
+    """
+    Loads the rerank model ahead of the first question (no-op while
+    reranking is disabled).
+    """
+
+    if not RERANK_ENABLED or model_name in _MODEL_REGISTRY:
+        return
+
+    if background:
+        threading.Thread(
+            target=get_rerank_model,
+            args=(model_name,),
+            daemon=True,
+        ).start()
+    else:
+        get_rerank_model(model_name)
+
+
+
+# Reranking
+
+
+def rerank_documents(
+    query: str,
+    documents: List[Document],
+    top_k: int = 4,
+    model_name: str = DEFAULT_RERANK_MODEL,
+    batch_size: int = RERANK_BATCH_SIZE,
+) -> List[Tuple[Document, float]]:
+    """
+    Rescores (query, chunk) pairs with the cross-encoder and returns
+    the top_k (document, score) pairs, best first.
+
+    All candidates are scored in batches of batch_size; at most
+    RERANK_MAX_CONCURRENCY rerank calls run at once per process.
+    """
+
+    if not documents:
+        return []
+
+    model = get_rerank_model(model_name)
+
+    pairs = [(query, doc.page_content) for doc in documents]
+
+    with _RERANK_SLOTS:
+        scores = np.asarray(
+            model.predict(
+                pairs,
+                batch_size=batch_size,
+                show_progress_bar=False,
+            ),
+            dtype=np.float32,
+        )
+
+    order = np.argsort(-scores)[:top_k]
+
+    return [(documents[i], float(scores[i])) for i in order]
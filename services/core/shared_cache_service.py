@@ -0,0 +1,90 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from services.core.vectorstore_service import VectorStoreService
+
+
+# Configuration
+
+
+DEFAULT_VECTORSTORE_CACHE_MAX_BYTES = int(
+    os.getenv("VECTORSTORE_CACHE_MAX_MB", "512")
+) * 1024 * 1024
+
+
+
+# Cross-session in-memory LRU
+
+
+class SharedVectorStoreCache:
+    """
+    Process-wide LRU of vector stores keyed by PDF file hash.
+
+    Sessions that upload the same PDF share one VectorStoreService
+    instance. Each entry is charged its index + document bytes and
+    least recently used entries are evicted past max_bytes.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_VECTORSTORE_CACHE_MAX_BYTES,
+    ):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, VectorStoreService]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, file_hash: str) -> Optional[VectorStoreService]:
+        with self._lock:
+            vectorstore = self._entries.get(file_hash)
+            if vectorstore is not None:
+                self._entries.move_to_end(file_hash)
+            return vectorstore
+
+    def put(
+        self,
+        file_hash: str,
+        vectorstore: VectorStoreService,
+    ) -> VectorStoreService:
+        """
+        Stores vectorstore and returns the canonical shared instance.
+
+        If another session already cached this hash, that instance is
+        returned instead so both sessions reference the same store.
+        """
+
+        size = vectorstore.memory_usage()
+
+        with self._lock:
+            existing = self._entries.get(file_hash)
+            if existing is not None:
+                self._entries.move_to_end(file_hash)
+                return existing
+
+            self._entries[file_hash] = vectorstore
+            self._sizes[file_hash] = size
+            self._total_bytes += size
+
+            self._evict()
+
+        return vectorstore
+
+    def _evict(self) -> None:
+        # always keep the most recent entry, even if it alone is over budget
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            file_hash, _ = self._entries.popitem(last=False)
+            self._total_bytes -= self._sizes.pop(file_hash, 0)
+
+
+    # Stats
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
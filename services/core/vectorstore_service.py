@@ -1,34 +1,995 @@
 # pylint: disable=E1120
 
-from typing import List
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+import itertools
+import json
+import os
+import sys
+import threading
 import faiss
 import numpy as np
 from langchain.schema import Document
 
+from services.core.index_factory import (
+    MappedFlatIndex,
+    build_index,
+    index_kind,
+    index_storage,
+    resolve_index_type,
+    resolve_storage,
+    search_parameters,
+)
+from services.core.lexical_index_service import (
+    RRF_K,
+    BM25Index,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+
+
+INDEX_FILENAME = "index.faiss"
+DOCUMENTS_FILENAME = "documents.json"
+LEXICAL_FILENAME = "lexical.npz"
+FULL_VECTORS_FILENAME = "vectors.npy"
+# float32 flat stores: raw vectors instead of index.faiss, so they
+# can be memory-mapped (FAISS reads IndexFlat fully into RAM)
+FLAT_VECTORS_FILENAME = "flat.npy"
+
+# quantized stores: keep float32 copies (memory-mapped once saved)
+# and rescore RESCORE_CANDIDATE_FACTOR × top_k candidates with them
+DEFAULT_RESCORE = os.getenv("VECTORSTORE_RESCORE", "0") == "1"
+RESCORE_CANDIDATE_FACTOR = 4
+
+# removed chunks stay in the indexes (masked out of searches) until
+# they exceed this fraction of the store, then it is compacted
+COMPACTION_THRESHOLD = 0.25
+
+# index versions are unique across all stores in the process, so a
+# retrieval cached for one instance never matches another instance
+# with the same file hash (e.g. a reload from the disk cache)
+_VERSION_COUNTER = itertools.count(1)
+
+# list-based callers are still supported
+Embeddings = Union[np.ndarray, Sequence[float], Sequence[Sequence[float]]]
+
+
+def _as_float32_matrix(embeddings: Embeddings) -> np.ndarray:
+    """
+    Returns a 2-D C-contiguous float32 view (no copy if already one).
+    """
+
+    vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+
+    return vectors
+
+
+def maximal_marginal_relevance(
+    query_scores: np.ndarray,
+    candidates: np.ndarray,
+    top_k: int,
+    lambda_mult: float = 0.5,
+) -> List[int]:
+    """
+    Greedy MMR over candidate unit vectors.
+
+    query_scores[i] is the query similarity of candidates[i].
+    Returns positions into candidates in selection order.
+    """
+
+    top_k = min(top_k, len(candidates))
+
+    # pairwise cosine similarities, computed once
+    pairwise = candidates @ candidates.T
+
+    selected = [int(np.argmax(query_scores))]
+    max_redundancy = pairwise[:, selected[0]].copy()
+
+    while len(selected) < top_k:
+        mmr = lambda_mult * query_scores - (1 - lambda_mult) * max_redundancy
+        mmr[selected] = -np.inf
+
+        best = int(np.argmax(mmr))
+        selected.append(best)
+
+        np.maximum(max_redundancy, pairwise[:, best], out=max_redundancy)
+
+    return selected
+
 
 class VectorStoreService:
-    def __init__(self, embedding_dimension: int):
+    def __init__(
+        self,
+        embedding_dimension: int,
+        index_type: Optional[str] = None,
+        storage: Optional[str] = None,
+        rescore: Optional[bool] = None,
+    ):
+        # vectors are always appended to an exact flat index first;
+        # optimize_index() converts it once the corpus size is known
+        # (and to float16 / int8 codes when storage asks for it)
         self.index = faiss.IndexFlatIP(embedding_dimension)
-        self.documents: List[Document] = []
+        self.index_type = index_type
+        self.storage = storage
+        self.rescore = DEFAULT_RESCORE if rescore is None else rescore
+
+        # full-precision rows for rescoring a quantized index; new
+        # rows are kept as blocks and concatenated on first use
+        self._full_vectors: Optional[np.ndarray] = None
+        self._full_blocks: List[np.ndarray] = []
+
+        # position = chunk id; removed chunks are None until compact()
+        self.documents: List[Optional[Document]] = []
+        self._removed: Set[int] = set()
+
+        # BM25 postings over the same chunk ids, for hybrid search
+        self.lexical_index = BM25Index()
+
+        # document id → chunk ids, for multi-document (library) stores
+        self._doc_chunks: Dict[str, List[int]] = {}
+
+        # lets a background ingest append while sessions search
+        self._lock = threading.Lock()
+
+        # set by load(mmap=True) when the index is backed by the
+        # saved files; cleared by _ensure_writable()
+        self._mapped = False
+
+        # content hash of the source PDF (set by the builder / cache)
+        self.file_hash: Optional[str] = None
+
+        # changes on every index change; retrieval caches key on it
+        self.version = next(_VERSION_COUNTER)
+
+        # updated by incremental (pipelined) ingestion
+        self.ingest_status = {
+            "pages_done": 0,
+            "total_pages": 0,
+            "chunks_indexed": 0,
+            "complete": True,
+        }
+
+    def add_documents(
+        self,
+        embeddings: Embeddings,
+        documents: List[Document],
+        doc_id: Optional[str] = None,
+    ):
+        """
+        Appends documents with their embeddings.
+
+        A C-contiguous float32 ndarray is handed to FAISS without a
+        copy; nested lists are still accepted for compatibility.
+        doc_id tags the chunks (metadata["doc_id"]) so searches can
+        be restricted to that source document.
+        """
+
+        vectors, token_lists = self._prepare(embeddings, documents, doc_id)
+
+        with self._lock:
+            self._append(vectors, documents, token_lists, doc_id)
+            self.version = next(_VERSION_COUNTER)
+
+    def _prepare(
+        self,
+        embeddings: Embeddings,
+        documents: List[Document],
+        doc_id: Optional[str],
+    ) -> Tuple[np.ndarray, List[List[str]]]:
+
+        vectors = _as_float32_matrix(embeddings)
+
+        if doc_id is not None:
+            for doc in documents:
+                doc.metadata["doc_id"] = doc_id
+
+        # tokenize outside the lock; searches keep running meanwhile
+        token_lists = [tokenize(doc.page_content) for doc in documents]
+
+        return vectors, token_lists
+
+    def _append(
+        self,
+        vectors: np.ndarray,
+        documents: List[Document],
+        token_lists: List[List[str]],
+        doc_id: Optional[str],
+    ) -> None:
+        # caller holds self._lock
+        self._ensure_writable()
+
+        start = len(self.documents)
 
-    def add_documents(self, embeddings: List[List[float]], documents: List[Document]):
-        vectors = np.asarray(embeddings, dtype="float32")
         self.index.add(vectors)
         self.documents.extend(documents)
+        self.lexical_index.add(token_lists)
+
+        if self._full_vectors is not None:
+            self._full_blocks.append(vectors.copy())
+
+        if doc_id is not None:
+            self._doc_chunks.setdefault(doc_id, []).extend(
+                range(start, start + len(documents))
+            )
+
+    def _ensure_writable(self) -> None:
+        """
+        Swaps a memory-mapped index for an in-memory copy before it
+        is modified.
+
+        Mapped IVF inverted lists are read-only and FAISS aborts the
+        process (no Python exception) on writes to them.
+        """
+
+        # caller holds self._lock
+        if not self._mapped:
+            return
+
+        if isinstance(self.index, MappedFlatIndex):
+            index = faiss.IndexFlatIP(self.index.d)
+            index.add(np.ascontiguousarray(self.index.vectors))
+            self.index = index
+
+        elif self.active_index_type in ("ivf", "ivfpq"):
+            mapped = self.index.invlists
+            invlists = faiss.ArrayInvertedLists(
+                mapped.nlist, mapped.code_size
+            )
+
+            for list_no in range(mapped.nlist):
+                size = mapped.list_size(list_no)
+                if size:
+                    invlists.add_entries(
+                        list_no, size,
+                        mapped.get_ids(list_no), mapped.get_codes(list_no),
+                    )
+
+            # the index takes ownership (and frees the mapped lists)
+            invlists.this.disown()
+            self.index.replace_invlists(invlists, True)
+
+        self._mapped = False
+
+    def document_ids(self) -> List[str]:
+        return list(self._doc_chunks)
+
+    @property
+    def num_chunks(self) -> int:
+        return len(self.documents) - len(self._removed)
+
+
+    # Removal / replacement
+
+    def _remove(self, doc_id: str) -> int:
+        # caller holds self._lock
+        chunk_ids = self._doc_chunks.pop(doc_id, [])
+
+        for chunk_id in chunk_ids:
+            self.documents[chunk_id] = None
+
+        self._removed.update(chunk_ids)
+
+        return len(chunk_ids)
+
+    def remove_document(self, doc_id: str) -> int:
+        """
+        Removes every chunk of doc_id; returns how many were removed.
+
+        Costs O(chunks of doc_id): the chunks are masked out of all
+        searches right away and dropped from the indexes by the next
+        compaction.
+        """
+
+        with self._lock:
+            removed = self._remove(doc_id)
+            if removed:
+                self.version = next(_VERSION_COUNTER)
+
+        self._compact_if_needed()
+
+        return removed
+
+    def replace_document(
+        self,
+        doc_id: str,
+        embeddings: Embeddings,
+        documents: List[Document],
+    ) -> None:
+        """
+        Swaps doc_id's chunks for new ones in one step, so searches
+        never see the document missing or duplicated.
+        """
+
+        vectors, token_lists = self._prepare(embeddings, documents, doc_id)
+
+        with self._lock:
+            self._remove(doc_id)
+            self._append(vectors, documents, token_lists, doc_id)
+            self.version = next(_VERSION_COUNTER)
+
+        self._compact_if_needed()
+
+    def _compact_if_needed(self) -> None:
+        if len(self._removed) > COMPACTION_THRESHOLD * len(self.documents):
+            self.compact()
+
+    def compact(self) -> int:
+        """
+        Drops removed chunks from the FAISS and BM25 indexes and
+        renumbers the remaining chunks in order.
+
+        Returns the number of chunks dropped.
+        """
+
+        with self._lock:
+            if not self._removed:
+                return 0
+
+            keep = np.ones(len(self.documents), dtype=bool)
+            keep[np.fromiter(self._removed, dtype=np.int64)] = False
+
+            self._ensure_writable()
+            self.index = self._compacted_index(keep)
+            self.lexical_index.compact(keep)
+
+            if self._full_vectors is not None:
+                self._full_vectors = self._full_precision()[keep]
+
+            remap = np.cumsum(keep) - 1
+
+            self.documents = [doc for doc in self.documents if doc is not None]
+            self._doc_chunks = {
+                doc_id: remap[chunk_ids].tolist()
+                for doc_id, chunk_ids in self._doc_chunks.items()
+            }
+
+            dropped = len(self._removed)
+            self._removed = set()
+            self.version = next(_VERSION_COUNTER)
+
+        return dropped
+
+    def _compacted_index(self, keep: np.ndarray):
+        """
+        A copy of self.index holding only the kept vectors, with ids
+        renumbered to their new positions.
+        """
+
+        kind = self.active_index_type
+
+        if kind == "flat":
+            # flat / scalar-quantized codes: removal shifts later ids
+            # down in order, which is exactly the renumbering we need
+            index = faiss.clone_index(self.index)
+
+            dropped = np.flatnonzero(~keep).astype(np.int64)
+            index.remove_ids(
+                faiss.IDSelectorBatch(len(dropped), faiss.swig_ptr(dropped))
+            )
+            return index
+
+        if kind in ("ivf", "ivfpq"):
+            # trained coarse quantizer and codes are kept as-is
+            index = faiss.clone_index(self.index)
+            index.set_direct_map_type(faiss.DirectMap.NoMap)
+
+            dropped = np.flatnonzero(~keep).astype(np.int64)
+            index.remove_ids(
+                faiss.IDSelectorBatch(len(dropped), faiss.swig_ptr(dropped))
+            )
+
+            remap = np.cumsum(keep) - 1
+            invlists = index.invlists
+
+            for list_no in range(index.nlist):
+                size = invlists.list_size(list_no)
+                if size == 0:
+                    continue
+
+                ids = faiss.rev_swig_ptr(invlists.get_ids(list_no), size)
+                codes = faiss.rev_swig_ptr(
+                    invlists.get_codes(list_no), size * invlists.code_size
+                ).copy()
+                new_ids = remap[ids].astype(np.int64)
+
+                invlists.update_entries(
+                    list_no, 0, size,
+                    faiss.swig_ptr(new_ids), faiss.swig_ptr(codes),
+                )
+
+            index.make_direct_map()
+            return index
+
+        # HNSW cannot remove nodes → rebuild the graph
+        if self._full_vectors is not None:
+            vectors = self._full_precision()[keep]
+        else:
+            vectors = self.index.reconstruct_n(0, self.index.ntotal)[keep]
+
+        return build_index(
+            "hnsw",
+            np.ascontiguousarray(vectors),
+            storage=index_storage(self.index),
+        )
+
+    def _chunk_ids(self, doc_ids: Sequence[str]) -> np.ndarray:
+        return np.asarray(
+            [
+                chunk_id
+                for doc_id in doc_ids
+                for chunk_id in self._doc_chunks.get(doc_id, ())
+            ],
+            dtype=np.int64,
+        )
+
+    def _search(
+        self,
+        query_vectors: np.ndarray,
+        top_k: int,
+        doc_ids: Optional[Sequence[str]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Raw FAISS search, optionally restricted to doc_ids' chunks.
+
+        The restriction is an ID selector, so vectors of other
+        documents are skipped instead of scored and filtered later.
+        """
+
+        with self._lock:
+            subset = removed = None
+
+            if doc_ids is not None:
+                # _doc_chunks never lists removed chunks
+                subset = self._chunk_ids(doc_ids)
+
+                if len(subset) == 0:
+                    empty = np.empty((len(query_vectors), 0))
+                    return empty.astype(np.float32), empty.astype(np.int64)
+
+                top_k = min(top_k, len(subset))
+
+            elif self._removed:
+                removed = np.fromiter(self._removed, dtype=np.int64)
+
+            if isinstance(self.index, MappedFlatIndex):
+                options = {"allowed_ids": subset, "excluded_ids": removed}
+
+            elif subset is not None:
+                # subset must stay alive for the duration of the search
+                selector = faiss.IDSelectorBatch(
+                    len(subset), faiss.swig_ptr(subset)
+                )
+                options = {"params": search_parameters(self.index, selector)}
+
+            elif removed is not None:
+                removed_selector = faiss.IDSelectorBatch(
+                    len(removed), faiss.swig_ptr(removed)
+                )
+                selector = faiss.IDSelectorNot(removed_selector)
+                options = {"params": search_parameters(self.index, selector)}
+
+            else:
+                options = {}
+
+            if self._full_vectors is None:
+                return self.index.search(query_vectors, top_k, **options)
+
+            scores, indices = self.index.search(
+                query_vectors,
+                top_k * RESCORE_CANDIDATE_FACTOR,
+                **options,
+            )
+
+            return self._rescore(query_vectors, indices, top_k)
+
+    def _full_precision(self) -> np.ndarray:
+        # caller holds self._lock
+        if self._full_blocks:
+            self._full_vectors = np.concatenate(
+                [self._full_vectors] + self._full_blocks
+            )
+            self._full_blocks = []
+
+        return self._full_vectors
+
+    def _rescore(
+        self,
+        query_vectors: np.ndarray,
+        indices: np.ndarray,
+        top_k: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Re-ranks quantized candidates by exact float32 inner product.
+        """
+
+        # caller holds self._lock
+        valid = indices >= 0
+
+        # only the candidate rows are read (memory-mapped after load)
+        candidates = self._full_precision()[np.where(valid, indices, 0)]
+
+        exact = np.einsum("qkd,qd->qk", candidates, query_vectors)
+        exact[~valid] = -np.inf
+
+        order = np.argsort(-exact, axis=1)[:, :top_k]
+
+        scores = np.take_along_axis(exact, order, axis=1).astype(np.float32)
+        indices = np.take_along_axis(indices, order, axis=1)
+        indices[np.isinf(scores)] = -1
+
+        return scores, indices
+
+    def similarity_search(self, query_embedding: Embeddings, top_k: int = 4):
+        return [
+            doc
+            for doc, _ in self.similarity_search_with_scores(
+                query_embedding, top_k=top_k
+            )
+        ]
+
+    def search_ids(
+        self,
+        query_embedding: Embeddings,
+        top_k: int = 4,
+        min_score: Optional[float] = None,
+        doc_ids: Optional[Sequence[str]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (chunk ids, cosine scores), best first.
+
+        Matches scoring below min_score are dropped, so fewer than
+        top_k results may be returned. doc_ids restricts the search
+        to those documents' chunks.
+        """
 
-    def similarity_search(self, query_embedding: List[float], top_k: int = 4):
         if self.index.ntotal == 0:
-            return []
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        query_vector = _as_float32_matrix(query_embedding)
+
+        scores, indices = self._search(query_vector, top_k, doc_ids)
+
+        scores, indices = scores[0], indices[0]
+
+        keep = (indices >= 0) & (indices < len(self.documents))
+        if min_score is not None:
+            keep &= scores >= min_score
+
+        return indices[keep], scores[keep]
+
+    def mmr_search_ids(
+        self,
+        query_embedding: Embeddings,
+        top_k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        min_score: Optional[float] = None,
+        doc_ids: Optional[Sequence[str]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fetches fetch_k candidates and re-selects top_k of them by
+        maximal marginal relevance (relevance vs. redundancy).
 
-        query_vector = (
-            np.asarray(query_embedding, dtype="float32")
-            .reshape(1, -1)
+        Scores returned are the original query similarities.
+        """
+
+        indices, scores = self.search_ids(
+            query_embedding, max(fetch_k, top_k), min_score, doc_ids
+        )
+
+        return self._mmr_select(indices, scores, scores, top_k, lambda_mult)
+
+    def _mmr_select(
+        self,
+        indices: np.ndarray,
+        scores: np.ndarray,
+        relevance: np.ndarray,
+        top_k: int,
+        lambda_mult: float,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+
+        if len(indices) <= 1:
+            return indices[:top_k], scores[:top_k]
+
+        with self._lock:
+            candidates = self.index.reconstruct_batch(indices)
+
+        order = maximal_marginal_relevance(
+            query_scores=relevance,
+            candidates=candidates,
+            top_k=top_k,
+            lambda_mult=lambda_mult,
         )
 
-        scores, indices = self.index.search(query_vector, top_k)
+        return indices[order], scores[order]
+
+    def lexical_search_ids(
+        self,
+        query_text: str,
+        top_k: int = 4,
+        doc_ids: Optional[Sequence[str]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (chunk ids, BM25 scores) of chunks sharing query terms.
+        """
+
+        with self._lock:
+            allowed = self._chunk_ids(doc_ids) if doc_ids is not None else None
+            excluded = (
+                np.fromiter(self._removed, dtype=np.int64)
+                if self._removed and allowed is None
+                else None
+            )
+
+            return self.lexical_index.search(
+                query_text, top_k, allowed, excluded
+            )
+
+    def hybrid_search_ids(
+        self,
+        query_embedding: Embeddings,
+        query_text: str,
+        top_k: int = 4,
+        fetch_k: int = 20,
+        min_score: Optional[float] = None,
+        doc_ids: Optional[Sequence[str]] = None,
+        lambda_mult: Optional[float] = None,
+        rrf_k: int = RRF_K,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Dense + BM25 retrieval fused by reciprocal rank.
+
+        fetch_k candidates are taken from each side; min_score only
+        filters the dense side, so chunks that literally contain the
+        query terms survive. With lambda_mult the fused candidates
+        are re-selected by MMR. Scores returned are the RRF scores.
+        """
+
+        fetch_k = max(fetch_k, top_k)
+
+        dense_ids, _ = self.search_ids(
+            query_embedding, fetch_k, min_score, doc_ids
+        )
+        lexical_ids, _ = self.lexical_search_ids(query_text, fetch_k, doc_ids)
+
+        if lambda_mult is None:
+            return reciprocal_rank_fusion(
+                [dense_ids, lexical_ids], top_k, k=rrf_k
+            )
+
+        ids, scores = reciprocal_rank_fusion(
+            [dense_ids, lexical_ids], fetch_k, k=rrf_k
+        )
+
+        if len(ids) == 0:
+            return ids, scores
+
+        # scale RRF scores to [0, 1] so they weigh like cosine redundancy
+        return self._mmr_select(
+            ids, scores, scores / scores[0], top_k, lambda_mult
+        )
+
+    def documents_with_scores(
+        self,
+        ids: Sequence[int],
+        scores: Sequence[float],
+    ) -> List[Tuple[Document, float]]:
+        return [
+            (self.documents[i], float(score))
+            for i, score in zip(ids, scores)
+        ]
+
+    def similarity_search_with_scores(
+        self,
+        query_embedding: Embeddings,
+        top_k: int = 4,
+        min_score: Optional[float] = None,
+        doc_ids: Optional[Sequence[str]] = None,
+    ) -> List[Tuple[Document, float]]:
+        """
+        Returns (document, cosine score) pairs, best first.
+        """
+
+        return self.documents_with_scores(
+            *self.search_ids(query_embedding, top_k, min_score, doc_ids)
+        )
+
+    def max_marginal_relevance_search(
+        self,
+        query_embedding: Embeddings,
+        top_k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        min_score: Optional[float] = None,
+        doc_ids: Optional[Sequence[str]] = None,
+    ) -> List[Tuple[Document, float]]:
+
+        return self.documents_with_scores(
+            *self.mmr_search_ids(
+                query_embedding,
+                top_k=top_k,
+                fetch_k=fetch_k,
+                lambda_mult=lambda_mult,
+                min_score=min_score,
+                doc_ids=doc_ids,
+            )
+        )
+
+    def similarity_search_batch(
+        self,
+        query_embeddings: Embeddings,
+        top_k: int = 4,
+        doc_ids: Optional[Sequence[str]] = None,
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Searches N queries with a single (N, d) FAISS call.
+
+        Returns one list of (document, score) pairs per query,
+        in query order, best match first.
+        """
+
+        query_vectors = _as_float32_matrix(query_embeddings)
+
+        if self.index.ntotal == 0:
+            return [[] for _ in range(len(query_vectors))]
+
+        scores, indices = self._search(query_vectors, top_k, doc_ids)
 
         return [
-            self.documents[i]
-            for i in indices[0]
-            if 0 <= i < len(self.documents)
+            [
+                (self.documents[i], float(score))
+                for i, score in zip(row_indices, row_scores)
+                if 0 <= i < len(self.documents)
+            ]
+            for row_indices, row_scores in zip(indices, scores)
+        ]
+
+
+    # Index backend
+
+    @property
+    def active_index_type(self) -> str:
+        return index_kind(self.index)
+
+    @property
+    def active_storage(self) -> str:
+        return index_storage(self.index)
+
+    def optimize_index(self, index_type: Optional[str] = None) -> str:
+        """
+        Rebuilds the flat index as the configured ANN backend and
+        vector storage.
+
+        "auto" picks flat / IVF / IVF-PQ by corpus size; float16 /
+        int8 storage scalar-quantizes the vectors (with rescore, the
+        float32 rows are kept for re-ranking). Only the initial
+        float32 flat index is converted; returns the backend in use
+        afterwards.
+        """
+
+        # don't carry removed chunks into the new index
+        self.compact()
+
+        with self._lock:
+            self._ensure_writable()
+
+            target = resolve_index_type(
+                index_type or self.index_type,
+                self.index.ntotal,
+            )
+            storage = resolve_storage(self.storage)
+
+            converted = not isinstance(self.index, faiss.IndexFlat)
+            unchanged = target == "flat" and storage == "float32"
+
+            if converted or unchanged or self.index.ntotal == 0:
+                return self.active_index_type
+
+            vectors = self.index.reconstruct_n(0, self.index.ntotal)
+            self.index = build_index(target, vectors, storage=storage)
+
+            if self.rescore and self.active_storage != "float32":
+                self._full_vectors = vectors
+
+            self.version = next(_VERSION_COUNTER)
+
+        return target
+
+
+    # Memory accounting
+
+    def index_nbytes(self) -> int:
+        """
+        Bytes held by the FAISS index vectors/codes.
+        """
+
+        index = self.index
+        kind = index_kind(index)
+
+        if isinstance(index, MappedFlatIndex):
+            # page cache, not process memory (like mapped rescore rows)
+            return 0
+
+        if kind in ("ivf", "ivfpq"):
+            return int(index.ntotal * index.code_size)
+
+        if kind == "hnsw":
+            links = index.hnsw.nb_neighbors(0) * 4
+            code_size = faiss.downcast_index(index.storage).code_size
+            return int(index.ntotal * (code_size + links))
+
+        codes = getattr(index, "codes", None)
+        if codes is not None:
+            return int(codes.size())
+
+        return int(index.ntotal * index.d * 4)
+
+    def documents_nbytes(self) -> int:
+        """
+        Approximate bytes held by the chunk Document objects.
+        """
+
+        total = sys.getsizeof(self.documents)
+
+        for doc in self.documents:
+            if doc is None:
+                continue
+            total += sys.getsizeof(doc.page_content)
+            total += sys.getsizeof(doc.metadata)
+            for key, value in doc.metadata.items():
+                total += sys.getsizeof(key) + sys.getsizeof(value)
+
+        return total
+
+    def full_vectors_nbytes(self) -> int:
+        """
+        RAM held by float32 rescoring rows (0 once memory-mapped).
+        """
+
+        blocks = sum(block.nbytes for block in self._full_blocks)
+
+        if self._full_vectors is None or isinstance(
+            self._full_vectors, np.memmap
+        ):
+            return blocks
+
+        return self._full_vectors.nbytes + blocks
+
+    def memory_usage(self) -> int:
+        return (
+            self.index_nbytes()
+            + self.documents_nbytes()
+            + self.lexical_index.nbytes()
+            + self.full_vectors_nbytes()
+        )
+
+
+    # Persistence
+
+    def save(self, directory: str) -> None:
+        """
+        Writes the FAISS index and chunk metadata into directory.
+
+        Removed chunks are compacted away first, so saved stores
+        never contain tombstones.
+        """
+
+        self.compact()
+
+        os.makedirs(directory, exist_ok=True)
+
+        if isinstance(self.index, (faiss.IndexFlat, MappedFlatIndex)):
+            with self._lock:
+                vectors = self.index.reconstruct_n(0, self.index.ntotal)
+            np.save(os.path.join(directory, FLAT_VECTORS_FILENAME), vectors)
+        else:
+            faiss.write_index(
+                self.index,
+                os.path.join(directory, INDEX_FILENAME),
+            )
+
+        self.lexical_index.save(os.path.join(directory, LEXICAL_FILENAME))
+
+        if self._full_vectors is not None:
+            with self._lock:
+                full_vectors = self._full_precision()
+            np.save(os.path.join(directory, FULL_VECTORS_FILENAME), full_vectors)
+
+        payload = [
+            {
+                "page_content": doc.page_content,
+                "metadata": doc.metadata,
+            }
+            for doc in self.documents
+        ]
+
+        with open(
+            os.path.join(directory, DOCUMENTS_FILENAME),
+            "w",
+            encoding="utf-8",
+        ) as f:
+            json.dump(payload, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "VectorStoreService":
+        """
+        Restores a store written by save().
+
+        With mmap=True float32 flat vectors and IVF inverted lists
+        are memory-mapped where the FAISS build supports it, otherwise
+        the index is read into memory. Mapped stores are copied into
+        memory on their first modification.
+        """
+
+        flat_path = os.path.join(directory, FLAT_VECTORS_FILENAME)
+        index_path = os.path.join(directory, INDEX_FILENAME)
+
+        index = None
+        mapped = False
+
+        if os.path.exists(flat_path):
+            vectors = np.load(flat_path, mmap_mode="r" if mmap else None)
+
+            if mmap:
+                index = MappedFlatIndex(vectors)
+                mapped = True
+            else:
+                index = faiss.IndexFlatIP(vectors.shape[1])
+                index.add(vectors)
+
+        elif mmap:
+            try:
+                index = faiss.read_index(
+                    index_path,
+                    faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY,
+                )
+                mapped = True
+            except RuntimeError:
+                index = None
+
+        if index is None:
+            index = faiss.read_index(index_path)
+
+        with open(
+            os.path.join(directory, DOCUMENTS_FILENAME),
+            encoding="utf-8",
+        ) as f:
+            payload = json.load(f)
+
+        store = cls(embedding_dimension=index.d)
+        store.index = index
+        store._mapped = mapped
+        store.documents = [
+            Document(
+                page_content=item["page_content"],
+                metadata=item.get("metadata") or {},
+            )
+            for item in payload
         ]
+
+        for chunk_id, doc in enumerate(store.documents):
+            doc_id = doc.metadata.get("doc_id")
+            if doc_id is not None:
+                store._doc_chunks.setdefault(doc_id, []).append(chunk_id)
+
+        full_path = os.path.join(directory, FULL_VECTORS_FILENAME)
+
+        if os.path.exists(full_path):
+            store.rescore = True
+            store._full_vectors = np.load(
+                full_path, mmap_mode="r" if mmap else None
+            )
+
+        lexical_path = os.path.join(directory, LEXICAL_FILENAME)
+
+        if os.path.exists(lexical_path):
+            store.lexical_index = BM25Index.load(lexical_path)
+        else:
+            # stores saved before hybrid search → rebuild from the text
+            store.lexical_index.add(
+                tokenize(doc.page_content) for doc in store.documents
+            )
+
+        return store
@@ -11,23 +11,32 @@ def generate_citations(
 
     Example:
     📄 Page 3 — "Self-attention allows the model to..."
+
+    When the chunks come from several PDFs (course library), the
+    file name is included:
+    📄 lecture_02.pdf, Page 3 — "Self-attention allows the model to..."
     """
 
     citations: List[str] = []
     seen_pages = set()
 
+    multi_source = len(
+        {(doc.metadata or {}).get("source") for doc in documents}
+    ) > 1
+
     for doc in documents:
 
         metadata = doc.metadata or {}
         page = metadata.get("page")
+        source = metadata.get("source")
 
         if page is None:
             continue
 
-        if page in seen_pages:
+        if (source, page) in seen_pages:
             continue
 
-        seen_pages.add(page)
+        seen_pages.add((source, page))
 
         text = (
             doc.page_content
@@ -42,8 +51,14 @@ def generate_citations(
             else text
         )
 
+        location = (
+            f"{source}, Page {page + 1}"
+            if multi_source and source
+            else f"Page {page + 1}"
+        )
+
         citations.append(
-            f"📄 Page {page + 1} — \"{snippet}\""
+            f"📄 {location} — \"{snippet}\""
         )
 
     return citations
@@ -0,0 +1,326 @@
+import argparse
+import io
+import json
+import os
+import shutil
+import threading
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+import streamlit as st
+
+from services.core.cache_service import CacheService
+from services.core.vectorstore_service import VectorStoreService
+from services.educational_chatbot.rag_service import (
+    EMBEDDING_DIMENSION,
+    index_pdf_incrementally,
+)
+
+
+# Configuration
+
+
+# instructor-provided PDFs: <COURSE_LIBRARY_DIR>/<course>/*.pdf
+COURSE_LIBRARY_DIR = os.getenv("COURSE_LIBRARY_DIR", "course_library")
+
+# pre-built course indexes (not subject to the per-PDF cache eviction)
+COURSE_INDEX_DIR = os.getenv(
+    "COURSE_INDEX_DIR",
+    os.path.join(".cache", "courses"),
+)
+
+MANIFEST_FILENAME = "library.json"
+
+
+
+# Course library
+
+
+class CourseLibrary:
+    """
+    One vector store holding every PDF of a course.
+
+    Chunks are tagged with their document id (the PDF content hash),
+    so retrieval can be restricted to a subset of the course via
+    doc_ids without searching the other documents.
+    """
+
+    def __init__(
+        self,
+        course_id: str,
+        vectorstore: Optional[VectorStoreService] = None,
+    ):
+        self.course_id = course_id
+
+        self.vectorstore = vectorstore or VectorStoreService(
+            embedding_dimension=EMBEDDING_DIMENSION
+        )
+        # retrieval cache key for the whole library
+        self.vectorstore.file_hash = f"course:{course_id}"
+
+        # doc_id → {"name", "pages", "chunks"}
+        self.documents: Dict[str, Dict] = {}
+
+        self._lock = threading.Lock()
+
+    def add_pdf(
+        self,
+        pdf_file,
+        progress_callback: Optional[Callable[[Dict], None]] = None,
+    ) -> str:
+        """
+        Indexes one PDF into the library; returns its document id.
+
+        PDFs already in the library (same content) are skipped. A new
+        version of a PDF (same file name, different content) replaces
+        the old one once it is fully indexed, so only that PDF is
+        re-embedded. The ANN conversion is left to optimize().
+        """
+
+        doc_id = CacheService.generate_file_hash(pdf_file)
+        name = getattr(pdf_file, "name", "uploaded.pdf")
+
+        with self._lock:
+            if doc_id in self.documents:
+                return doc_id
+
+            status = index_pdf_incrementally(
+                pdf_file,
+                self.vectorstore,
+                progress_callback=progress_callback,
+                doc_id=doc_id,
+                optimize=False,
+            ).ingest_status
+
+            self.documents[doc_id] = {
+                "name": name,
+                "pages": status["total_pages"],
+                "chunks": status["chunks_indexed"],
+            }
+
+            # the old version stays searchable until the new one is in
+            for old_id, info in list(self.documents.items()):
+                if old_id != doc_id and info["name"] == name:
+                    self._remove(old_id)
+
+        return doc_id
+
+    def remove_pdf(self, doc_id: str) -> None:
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id: str) -> None:
+        # caller holds self._lock
+        self.documents.pop(doc_id, None)
+        self.vectorstore.remove_document(doc_id)
+
+    def optimize(self) -> str:
+        return self.vectorstore.optimize_index()
+
+    def document_names(self) -> Dict[str, str]:
+        return {
+            doc_id: info["name"]
+            for doc_id, info in self.documents.items()
+        }
+
+
+    # Persistence
+
+    def save(self, directory: str) -> None:
+        """
+        Writes the store and manifest, replacing directory atomically.
+        """
+
+        tmp_dir = f"{directory}.tmp-{os.getpid()}-{threading.get_ident()}"
+
+        self.vectorstore.save(tmp_dir)
+
+        with open(
+            os.path.join(tmp_dir, MANIFEST_FILENAME),
+            "w",
+            encoding="utf-8",
+        ) as f:
+            json.dump(
+                {"course_id": self.course_id, "documents": self.documents},
+                f,
+                ensure_ascii=False,
+            )
+
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp_dir, directory)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "CourseLibrary":
+        with open(
+            os.path.join(directory, MANIFEST_FILENAME),
+            encoding="utf-8",
+        ) as f:
+            manifest = json.load(f)
+
+        library = cls(
+            course_id=manifest["course_id"],
+            vectorstore=VectorStoreService.load(directory, mmap=mmap),
+        )
+        library.documents = manifest.get("documents") or {}
+
+        return library
+
+
+
+# Course discovery
+
+
+def _course_source_dir(course_id: str) -> str:
+    return os.path.join(COURSE_LIBRARY_DIR, course_id)
+
+
+def _course_index_dir(course_id: str) -> str:
+    return os.path.join(COURSE_INDEX_DIR, course_id)
+
+
+def _course_pdf_paths(course_id: str) -> List[str]:
+    source_dir = _course_source_dir(course_id)
+
+    if not os.path.isdir(source_dir):
+        return []
+
+    return sorted(
+        os.path.join(source_dir, name)
+        for name in os.listdir(source_dir)
+        if name.lower().endswith(".pdf")
+    )
+
+
+def list_courses() -> List[str]:
+    """
+    Courses with instructor PDFs or a pre-built index.
+    """
+
+    courses = set()
+
+    for root in (COURSE_LIBRARY_DIR, COURSE_INDEX_DIR):
+        if not os.path.isdir(root):
+            continue
+
+        for name in os.listdir(root):
+            if ".tmp-" in name or not os.path.isdir(os.path.join(root, name)):
+                continue
+            courses.add(name)
+
+    return sorted(courses)
+
+
+
+# Build / load
+
+
+def build_course_library(
+    course_id: str,
+    pdf_paths: Optional[List[str]] = None,
+    progress_callback: Optional[Callable[[str, Dict], None]] = None,
+) -> CourseLibrary:
+    """
+    Indexes a course's PDFs and saves the library to COURSE_INDEX_DIR.
+
+    An existing library is updated in place: PDFs it already
+    contains are skipped, changed PDFs are replaced and (when syncing
+    the whole course folder) deleted PDFs are removed, so re-running
+    after editing one chapter only re-indexes that chapter.
+    progress_callback receives (pdf name, ingest status).
+    """
+
+    index_dir = _course_index_dir(course_id)
+
+    if os.path.isdir(index_dir):
+        library = CourseLibrary.load(index_dir, mmap=False)
+    else:
+        library = CourseLibrary(course_id)
+
+    sync_folder = not pdf_paths
+    pdf_paths = pdf_paths or _course_pdf_paths(course_id)
+
+    if sync_folder:
+        names = {os.path.basename(path) for path in pdf_paths}
+
+        for doc_id, info in list(library.documents.items()):
+            if info["name"] not in names:
+                library.remove_pdf(doc_id)
+
+    for path in pdf_paths:
+        with open(path, "rb") as f:
+            pdf_file = io.BytesIO(f.read())
+        pdf_file.name = os.path.basename(path)
+
+        library.add_pdf(
+            pdf_file,
+            progress_callback=(
+                partial(progress_callback, pdf_file.name)
+                if progress_callback
+                else None
+            ),
+        )
+
+    library.optimize()
+    library.save(index_dir)
+
+    return library
+
+
+@st.cache_resource(show_spinner=False)
+def get_course_library(course_id: str) -> CourseLibrary:
+    """
+    Process-wide course library shared by every student session.
+
+    Loads the pre-built index when an instructor has prepared one;
+    otherwise builds it once from COURSE_LIBRARY_DIR.
+    """
+
+    index_dir = _course_index_dir(course_id)
+
+    if os.path.isdir(index_dir):
+        return CourseLibrary.load(index_dir, mmap=True)
+
+    return build_course_library(course_id)
+
+
+
+# Instructor pre-load
+
+
+def main() -> None:
+    """
+    Pre-builds course libraries so students never wait on ingestion.
+
+    Usage:
+        python -m services.educational_chatbot.course_library_service COURSE [PDF ...]
+
+    Without PDF paths, every PDF in COURSE_LIBRARY_DIR/COURSE is used.
+    """
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("course")
+    parser.add_argument("pdfs", nargs="*")
+    args = parser.parse_args()
+
+    def _report(name: str, status: Dict) -> None:
+        print(
+            f"{name}: {status['pages_done']}/{status['total_pages']} pages, "
+            f"{status['chunks_indexed']} chunks",
+            end="\r" if not status["complete"] else "\n",
+        )
+
+    library = build_course_library(
+        args.course,
+        pdf_paths=args.pdfs or None,
+        progress_callback=_report,
+    )
+
+    print(
+        f"Course '{library.course_id}': {len(library.documents)} documents, "
+        f"{library.vectorstore.index.ntotal} chunks, "
+        f"index={library.vectorstore.active_index_type}"
+    )
+
+
+if __name__ == "__main__":
+    main()
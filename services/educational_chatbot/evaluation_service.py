@@ -1,6 +1,15 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
+import asyncio
+import os
 
-from services.core.groq_client import get_groq_response
+from groq import AsyncGroq
+
+from services.core.groq_client import (
+    create_async_groq_client,
+    get_groq_response,
+    get_groq_response_async,
+)
+from services.core.llm_errors import LLMError, LLMTimeoutError
 
 from utils.prompt_templates import (
     SINGLE_QUESTION_EVALUATION_PROMPT,
@@ -8,6 +17,10 @@ from utils.prompt_templates import (
 )
 
 
+EVALUATION_CONCURRENCY = int(os.getenv("EVALUATION_CONCURRENCY", "5"))
+EVALUATION_TIMEOUT_SECONDS = float(os.getenv("EVALUATION_TIMEOUT_SECONDS", "45"))
+
+
 
 # SINGLE QUESTION EVALUATION (10 MARKS)
 
@@ -39,6 +52,88 @@ def evaluate_single_answer(
     }
 
 
+async def evaluate_single_answer_async(
+    question: str,
+    student_answer: str,
+    reference_context: str,
+    client: Optional[AsyncGroq] = None,
+    timeout: float = EVALUATION_TIMEOUT_SECONDS,
+) -> Dict:
+    """
+    asyncio variant of evaluate_single_answer; timeout applies to
+    each Groq request.
+    """
+
+    prompt = SINGLE_QUESTION_EVALUATION_PROMPT.format(
+        question=question,
+        student_answer=student_answer,
+        reference_context=reference_context,
+    )
+
+    try:
+        response = await get_groq_response_async(
+            prompt=prompt,
+            temperature=0.15,
+            max_tokens=300,
+            client=client,
+            timeout=timeout,
+        )
+    except LLMTimeoutError:
+        response = (
+            "⚠️ Evaluation for this question timed out. "
+            "Marks could not be assigned."
+        )
+    except LLMError as e:
+        # quota / configuration problems fail the whole exam
+        if not e.retryable:
+            raise
+        response = (
+            f"⚠️ {e.user_message} "
+            "Marks could not be assigned."
+        )
+
+    return {
+        "question": question,
+        "evaluation": response,
+    }
+
+
+async def _evaluate_all_async(
+    questions: List[str],
+    student_answers: List[str],
+    reference_context: str,
+    concurrency: int,
+) -> List[Dict]:
+    """
+    Grades every answer concurrently (at most `concurrency` in
+    flight); results come back in question order.
+    """
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    # a missing API key raises LLMConfigurationError here
+    client = create_async_groq_client()
+
+    async def _evaluate(question: str, answer: str) -> Dict:
+        async with semaphore:
+            return await evaluate_single_answer_async(
+                question=question,
+                student_answer=answer,
+                reference_context=reference_context,
+                client=client,
+            )
+
+    try:
+        return await asyncio.gather(
+            *(
+                _evaluate(question, answer)
+                for question, answer in zip(questions, student_answers)
+            )
+        )
+    finally:
+        await client.close()
+
+
 
 # MULTI-QUESTION EXAM EVALUATION
 
@@ -61,17 +156,18 @@ def evaluate_exam_answers(
 
     max_score = len(questions) * 10
 
-    detailed_blocks = []
-
-    for idx, (question, answer) in enumerate(
-        zip(questions, student_answers), start=1
-    ):
-        result = evaluate_single_answer(
-            question=question,
-            student_answer=answer,
+    results = asyncio.run(
+        _evaluate_all_async(
+            questions=questions,
+            student_answers=student_answers,
             reference_context=reference_context,
+            concurrency=EVALUATION_CONCURRENCY,
         )
+    )
+
+    detailed_blocks = []
 
+    for idx, result in enumerate(results, start=1):
         detailed_blocks.append(
             f"""
 ==============================
@@ -54,6 +54,7 @@ def generate_questions_from_context(
         prompt=prompt,
         temperature=0.3,
         max_tokens=500,
+        use_cache=False,  # each click should give fresh questions
     )
 
    
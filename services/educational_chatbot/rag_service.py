@@ -1,12 +1,28 @@
-from typing import List, Tuple, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, Optional
+from collections import OrderedDict
+import io
+import os
+import threading
+import time
+
+import numpy as np
 
 from langchain.schema import Document
 
-from services.core.pdf_service import process_pdf
-from services.core.embedding_service import EmbeddingService
+from services.core.pdf_service import (
+    count_pdf_pages,
+    iter_pdf_documents,
+    iter_pdf_chunks,
+)
+from services.core.embedding_service import EmbeddingService, normalize_query
 from services.core.vectorstore_service import VectorStoreService
 from services.core.cache_service import CacheService
-from services.core.groq_client import get_groq_response
+from services.core.rerank_service import RERANK_ENABLED, rerank_documents
+from services.core.groq_client import (
+    PRIORITY_INTERACTIVE,
+    get_groq_response,
+    stream_groq_response,
+)
 
 from utils.prompt_templates import (
     RAG_ANSWER_PROMPT,
@@ -15,12 +31,124 @@ from utils.prompt_templates import (
 
 
 EMBEDDING_DIMENSION = 384
+INGEST_BATCH_SIZE = 64
+
+# Answer retrieval: drop weak matches, diversify the rest
+RAG_MIN_SIMILARITY = 0.2
+MMR_FETCH_K = 20
+MMR_LAMBDA = 0.6
+
+# fuse BM25 (exact terms, acronyms, formulas) with dense retrieval
+HYBRID_RETRIEVAL = os.getenv("RAG_HYBRID_RETRIEVAL", "1") != "0"
+
+# with RAG_RERANK=1: wide cheap retrieval, cross-encoder picks fewer
+# (better) chunks for the prompt
+RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", "20"))
+RERANK_TOP_K = int(os.getenv("RERANK_TOP_K", "3"))
+
+RETRIEVAL_CACHE_SIZE = 512
+RETRIEVAL_CACHE_TTL_SECONDS = 15 * 60
+
+
+# PIPELINED INGEST
+
+def _batched(
+    documents: Iterable[Document],
+    batch_size: int,
+) -> Iterator[List[Document]]:
+
+    batch: List[Document] = []
+
+    for doc in documents:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def index_pdf_incrementally(
+    pdf_file,
+    vectorstore: VectorStoreService,
+    batch_size: int = INGEST_BATCH_SIZE,
+    progress_callback: Optional[Callable[[Dict], None]] = None,
+    doc_id: Optional[str] = None,
+    optimize: bool = True,
+) -> VectorStoreService:
+    """
+    Streams pages → chunks → embedding batches into vectorstore.
+
+    Each batch is searchable as soon as it is appended, and only
+    one batch of chunks / embeddings is held in memory at a time.
+    progress_callback receives a copy of vectorstore.ingest_status
+    after every batch.
+
+    doc_id tags the chunks for filtered search in a multi-document
+    store; optimize=False defers the ANN conversion (e.g. until a
+    whole course has been added).
+    """
+
+    status = vectorstore.ingest_status
+    status.update(
+        pages_done=0,
+        total_pages=count_pdf_pages(pdf_file),
+        chunks_indexed=0,
+        complete=False,
+    )
+
+    def _pages() -> Iterator[Document]:
+        for page in iter_pdf_documents(pdf_file):
+            yield page
+            status["pages_done"] += 1
+
+    embedder = EmbeddingService()
+
+    for batch in _batched(iter_pdf_chunks(_pages()), batch_size):
+        embeddings = embedder.embed_texts_array(
+            [doc.page_content for doc in batch]
+        )
+
+        vectorstore.add_documents(
+            embeddings=embeddings,
+            documents=batch,
+            doc_id=doc_id,
+        )
+
+        status["chunks_indexed"] += len(batch)
+
+        if progress_callback:
+            progress_callback(dict(status))
+
+    # large corpora switch to an ANN backend once fully embedded
+    if optimize:
+        vectorstore.optimize_index()
+
+    status["pages_done"] = status["total_pages"]
+    status["complete"] = True
+
+    if progress_callback:
+        progress_callback(dict(status))
+
+    return vectorstore
 
 
 # VECTORSTORE BUILDER
-def build_vectorstore_from_pdf(pdf_file) -> VectorStoreService:
+def build_vectorstore_from_pdf(
+    pdf_file,
+    progress_callback: Optional[Callable[[Dict], None]] = None,
+    background: bool = False,
+) -> VectorStoreService:
     """
     Builds or retrieves a cached FAISS vector store for an uploaded PDF.
+
+    The BM25 inverted index used by hybrid retrieval is filled batch
+    by batch alongside the FAISS index.
+
+    background=True returns the (still filling) store immediately and
+    indexes in a daemon thread; callers can search it right away and
+    poll vectorstore.ingest_status for progress.
     """
 
     file_hash = CacheService.generate_file_hash(pdf_file)
@@ -29,61 +157,275 @@ def build_vectorstore_from_pdf(pdf_file) -> VectorStoreService:
     if cached_store:
         return cached_store
 
-    documents: List[Document] = process_pdf(pdf_file)
-
-    texts = [doc.page_content for doc in documents]
-
-    embedder = EmbeddingService()
-    embeddings = embedder.embed_texts(texts)
-
     vectorstore = VectorStoreService(
         embedding_dimension=EMBEDDING_DIMENSION
     )
+    vectorstore.file_hash = file_hash
+
+    # drop results computed against an earlier build of this PDF
+    _RETRIEVAL_CACHE.invalidate(file_hash)
+
+    if background:
+        # private copy: Streamlit may reuse the upload buffer on rerun
+        pdf_copy = io.BytesIO(pdf_file.getvalue())
+        pdf_copy.name = getattr(pdf_file, "name", "uploaded.pdf")
+
+        vectorstore.ingest_status["complete"] = False
+
+        def _run():
+            try:
+                index_pdf_incrementally(
+                    pdf_copy,
+                    vectorstore,
+                    progress_callback=progress_callback,
+                )
+            except Exception as e:
+                vectorstore.ingest_status["error"] = str(e)
+                return
 
-    vectorstore.add_documents(
-        embeddings=embeddings,
-        documents=documents,
+            CacheService.publish_vectorstore(file_hash, vectorstore)
+
+        threading.Thread(target=_run, daemon=True).start()
+
+        return vectorstore
+
+    index_pdf_incrementally(
+        pdf_file,
+        vectorstore,
+        progress_callback=progress_callback,
     )
 
-    CacheService.set_cached_vectorstore(file_hash, vectorstore)
+    # another session may have indexed the same PDF meanwhile
+    vectorstore = CacheService.set_cached_vectorstore(file_hash, vectorstore)
 
     return vectorstore
 
 
 
+# RETRIEVAL RESULT CACHE
+
+class RetrievalCache:
+    """
+    TTL + LRU cache of retrieval results (chunk ids and scores).
+
+    Keyed by the PDF file hash, normalized query and search
+    parameters. Entries remember the vectorstore version they were
+    computed against and are dropped once the index changes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RETRIEVAL_CACHE_SIZE,
+        ttl_seconds: float = RETRIEVAL_CACHE_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[int, float, np.ndarray, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple, version: int):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            entry_version, created_at, ids, scores = entry
+
+            if (
+                entry_version != version
+                or time.monotonic() - created_at > self.ttl_seconds
+            ):
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return ids, scores
+
+    def put(self, key: Tuple, version: int, ids, scores) -> None:
+        with self._lock:
+            self._entries[key] = (version, time.monotonic(), ids, scores)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, file_hash: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == file_hash]:
+                del self._entries[key]
+
+
+_RETRIEVAL_CACHE = RetrievalCache()
+
+
+
 # SAFE RETRIEVAL LAYER
+def retrieve_documents_with_scores(
+    vectorstore: VectorStoreService,
+    query: str,
+    top_k: int = 4,
+    min_score: Optional[float] = None,
+    use_mmr: bool = False,
+    fetch_k: int = MMR_FETCH_K,
+    doc_ids: Optional[Sequence[str]] = None,
+    hybrid: bool = False,
+) -> List[Tuple[Document, float]]:
+    """
+    Returns (document, similarity) pairs for query.
+
+    min_score drops weakly related chunks; use_mmr re-selects the
+    fetch_k nearest chunks for diversity; doc_ids restricts a
+    library store to some of its documents. hybrid fuses dense and
+    BM25 rankings (scores are then RRF scores). Results are cached
+    per PDF until the index changes or the TTL expires.
+    """
+
+    store_key = vectorstore.file_hash or id(vectorstore)
+
+    cache_key = (
+        store_key,
+        normalize_query(query),
+        top_k,
+        min_score,
+        fetch_k if use_mmr else None,
+        tuple(sorted(doc_ids)) if doc_ids is not None else None,
+        hybrid,
+    )
+    version = vectorstore.version
+
+    cached = _RETRIEVAL_CACHE.get(cache_key, version)
+    if cached is not None:
+        return vectorstore.documents_with_scores(*cached)
+
+    embedder = EmbeddingService()
+    query_embedding = embedder.embed_query_array(query)
+
+    if hybrid:
+        ids, scores = vectorstore.hybrid_search_ids(
+            query_embedding=query_embedding,
+            query_text=query,
+            top_k=top_k,
+            fetch_k=fetch_k,
+            min_score=min_score,
+            doc_ids=doc_ids,
+            lambda_mult=MMR_LAMBDA if use_mmr else None,
+        )
+    elif use_mmr:
+        ids, scores = vectorstore.mmr_search_ids(
+            query_embedding=query_embedding,
+            top_k=top_k,
+            fetch_k=fetch_k,
+            lambda_mult=MMR_LAMBDA,
+            min_score=min_score,
+            doc_ids=doc_ids,
+        )
+    else:
+        ids, scores = vectorstore.search_ids(
+            query_embedding=query_embedding,
+            top_k=top_k,
+            min_score=min_score,
+            doc_ids=doc_ids,
+        )
+
+    _RETRIEVAL_CACHE.put(cache_key, version, ids, scores)
+
+    return vectorstore.documents_with_scores(ids, scores)
+
+
 def retrieve_documents(
     vectorstore: VectorStoreService,
     query: str,
     top_k: int = 4,
+    min_score: Optional[float] = None,
+    use_mmr: bool = False,
+    doc_ids: Optional[Sequence[str]] = None,
+    hybrid: bool = False,
 ) -> List[Document]:
 
+    return [
+        doc
+        for doc, _ in retrieve_documents_with_scores(
+            vectorstore=vectorstore,
+            query=query,
+            top_k=top_k,
+            min_score=min_score,
+            use_mmr=use_mmr,
+            doc_ids=doc_ids,
+            hybrid=hybrid,
+        )
+    ]
+
+
+
+# BATCHED RETRIEVAL
+def retrieve_documents_batch(
+    vectorstore: VectorStoreService,
+    queries: List[str],
+    top_k: int = 4,
+    doc_ids: Optional[Sequence[str]] = None,
+) -> List[List[Tuple[Document, float]]]:
+    """
+    Retrieves for several queries with one encoder call and one
+    FAISS search. Returns (document, score) lists in query order.
+    """
+
+    if not queries:
+        return []
+
     embedder = EmbeddingService()
-    query_embedding = embedder.embed_query(query)
+    query_embeddings = embedder.embed_queries_array(queries)
 
-    return vectorstore.similarity_search(
-        query_embedding=query_embedding,
+    return vectorstore.similarity_search_batch(
+        query_embeddings=query_embeddings,
         top_k=top_k,
+        doc_ids=doc_ids,
     )
 
 
 
 # RAG QUESTION ANSWERING (WITH MEMORY)
-def ask_question_with_rag(
+def _build_rag_prompt(
     vectorstore: VectorStoreService,
     question: str,
-    top_k: int = 4,
-    memory_text: Optional[str] = None,
+    top_k: int,
+    memory_text: Optional[str],
+    doc_ids: Optional[Sequence[str]] = None,
 ) -> Tuple[str, List[Document]]:
     """
-    Retrieval-Augmented Question Answering with conversation memory.
+    Retrieves context and builds the RAG answer prompt.
+
+    With reranking enabled, RERANK_CANDIDATES chunks are retrieved
+    and the cross-encoder keeps at most RERANK_TOP_K of them.
     """
 
-    retrieved_docs = retrieve_documents(
-        vectorstore=vectorstore,
-        query=question,
-        top_k=top_k,
-    )
+    if RERANK_ENABLED:
+        candidates = retrieve_documents(
+            vectorstore=vectorstore,
+            query=question,
+            top_k=max(RERANK_CANDIDATES, top_k),
+            min_score=RAG_MIN_SIMILARITY,
+            doc_ids=doc_ids,
+            hybrid=HYBRID_RETRIEVAL,
+        )
+
+        retrieved_docs = [
+            doc
+            for doc, _ in rerank_documents(
+                question,
+                candidates,
+                top_k=min(top_k, RERANK_TOP_K),
+            )
+        ]
+    else:
+        retrieved_docs = retrieve_documents(
+            vectorstore=vectorstore,
+            query=question,
+            top_k=top_k,
+            min_score=RAG_MIN_SIMILARITY,
+            use_mmr=True,
+            doc_ids=doc_ids,
+            hybrid=HYBRID_RETRIEVAL,
+        )
 
    
     # Build document context
@@ -94,6 +436,10 @@ def ask_question_with_rag(
         page = doc.metadata.get("page", "N/A")
         content = doc.page_content.strip()
 
+        # library chunks also name their PDF
+        if "doc_id" in doc.metadata:
+            content = f"(Source: {doc.metadata.get('source')})\n{content}"
+
         context_blocks.append(
             f"[Page {page + 1}]\n{content}"
         )
@@ -118,14 +464,57 @@ Conversation so far:
         question=question,
     )
 
+    return prompt, retrieved_docs
+
+
+def ask_question_with_rag(
+    vectorstore: VectorStoreService,
+    question: str,
+    top_k: int = 4,
+    memory_text: Optional[str] = None,
+    doc_ids: Optional[Sequence[str]] = None,
+) -> Tuple[str, List[Document]]:
+    """
+    Retrieval-Augmented Question Answering with conversation memory.
+    """
+
+    prompt, retrieved_docs = _build_rag_prompt(
+        vectorstore, question, top_k, memory_text, doc_ids
+    )
+
     answer = get_groq_response(
         prompt=prompt,
         temperature=0.2,
+        priority=PRIORITY_INTERACTIVE,
     )
 
     return answer, retrieved_docs
 
 
+def ask_question_with_rag_stream(
+    vectorstore: VectorStoreService,
+    question: str,
+    top_k: int = 4,
+    memory_text: Optional[str] = None,
+    doc_ids: Optional[Sequence[str]] = None,
+) -> Tuple[Iterator[str], List[Document]]:
+    """
+    Streaming variant: retrieval runs eagerly, the answer is
+    returned as a token iterator for st.write_stream.
+    """
+
+    prompt, retrieved_docs = _build_rag_prompt(
+        vectorstore, question, top_k, memory_text, doc_ids
+    )
+
+    answer_stream = stream_groq_response(
+        prompt=prompt,
+        temperature=0.2,
+    )
+
+    return answer_stream, retrieved_docs
+
+
 
 # QUESTION GENERATION FROM PDF
 
@@ -178,19 +567,40 @@ def get_exam_context(
     vectorstore: VectorStoreService,
     questions: List[str],
     top_k: int = 8,
+    doc_ids: Optional[Sequence[str]] = None,
 ) -> str:
     """
     Retrieves shared reference context for exam evaluation.
-    """
 
-    combined_query = " ".join(questions)
+    Each question is searched separately (in one batch) and the
+    per-question results are interleaved by rank, so every
+    question contributes context.
+    """
 
-    docs = retrieve_documents(
+    results = retrieve_documents_batch(
         vectorstore=vectorstore,
-        query=combined_query,
+        queries=questions,
         top_k=top_k,
+        doc_ids=doc_ids,
     )
 
+    docs: List[Document] = []
+    seen = set()
+
+    for rank in range(top_k):
+        for per_question in results:
+            if rank >= len(per_question):
+                continue
+
+            doc, _ = per_question[rank]
+            if id(doc) in seen:
+                continue
+
+            seen.add(id(doc))
+            docs.append(doc)
+
+    docs = docs[:top_k]
+
     return "\n\n".join(
         doc.page_content for doc in docs
     )
@@ -203,6 +613,7 @@ def get_context_text(
     vectorstore: VectorStoreService,
     query: str,
     top_k: int = 4,
+    doc_ids: Optional[Sequence[str]] = None,
 ) -> str:
     """
     Returns merged reference context for one question.
@@ -212,6 +623,7 @@ def get_context_text(
         vectorstore=vectorstore,
         query=query,
         top_k=top_k,
+        doc_ids=doc_ids,
     )
 
     return "\n".join(
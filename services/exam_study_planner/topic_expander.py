@@ -1,4 +1,5 @@
 from services.core.groq_client import get_groq_response
+from services.core.llm_errors import LLMError
 from services.exam_study_planner.planner_utils import (
     difficulty_prompt_hint,
 )
@@ -27,11 +28,15 @@ def expand_topic_into_subtopics(
         difficulty_hint=difficulty_hint,
     )
 
-    response = get_groq_response(
-        prompt=prompt,
-        temperature=0.25 if difficulty == "hard" else 0.2,
-        max_tokens=400,
-    )
+    try:
+        response = get_groq_response(
+            prompt=prompt,
+            temperature=0.25 if difficulty == "hard" else 0.2,
+            max_tokens=400,
+        )
+    except LLMError:
+        # fall through to the non-LLM fallback subtopics below
+        response = ""
 
     lines = response.splitlines()
     subtopics: list[str] = []
@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("groq")
+pytest.importorskip("dotenv")
+
+from services.core.groq_client import RetryPolicy  # noqa: E402
+from services.core.llm_errors import (  # noqa: E402
+    LLMConfigurationError,
+    LLMQuotaExceededError,
+    LLMRateLimitError,
+    LLMTimeoutError,
+)
+
+
+def test_retryable_errors_retry_until_max_attempts():
+    policy = RetryPolicy(max_attempts=3)
+    error = LLMTimeoutError("slow")
+
+    assert policy.should_retry(error, 0)
+    assert policy.should_retry(error, 1)
+    assert not policy.should_retry(error, 2)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [LLMQuotaExceededError("daily"), LLMConfigurationError("no key")],
+)
+def test_non_retryable_errors_fail_fast(error):
+    assert not RetryPolicy(max_attempts=5).should_retry(error, 0)
+
+
+def test_delay_honours_retry_after_up_to_the_cap():
+    policy = RetryPolicy(max_delay_seconds=10)
+
+    assert policy.delay(LLMRateLimitError("429", retry_after=4), 0) == 4
+    assert policy.delay(LLMRateLimitError("429", retry_after=60), 0) == 10
+
+
+def test_delay_is_jittered_exponential_backoff():
+    policy = RetryPolicy(base_delay_seconds=1, max_delay_seconds=30)
+
+    for attempt in range(4):
+        delay = policy.delay(LLMTimeoutError("slow"), attempt)
+        assert 0.5 * 2 ** attempt <= delay <= 2 ** attempt
@@ -0,0 +1,128 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from services.core.lexical_index_service import (  # noqa: E402
+    MAX_TOKEN_LENGTH,
+    BM25Index,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+
+
+CHUNKS = [
+    "ATP is the energy currency of the cell",
+    "Mitochondria produce ATP through respiration",
+    "Photosynthesis converts light into chemical energy",
+    "The Krebs cycle runs inside the mitochondria",
+]
+
+
+def build_index() -> BM25Index:
+    index = BM25Index()
+    index.add(tokenize(chunk) for chunk in CHUNKS)
+    return index
+
+
+# Tokenization
+
+
+def test_tokenize_lowercases_and_drops_stopwords():
+    assert tokenize("What is the ATP of H2O?") == ["atp", "h2o"]
+
+
+def test_tokenize_drops_run_on_tokens():
+    run_on = "x" * (MAX_TOKEN_LENGTH + 1)
+
+    assert tokenize(f"cell {run_on} wall") == ["cell", "wall"]
+
+
+# Search
+
+
+def test_search_ranks_chunks_containing_query_terms():
+    ids, scores = build_index().search("mitochondria ATP", top_k=4)
+
+    assert ids[0] == 1
+    assert set(ids.tolist()) == {0, 1, 3}
+    assert np.all(np.diff(scores) <= 0)
+
+
+def test_search_respects_allowed_and_excluded_ids():
+    index = build_index()
+
+    ids, _ = index.search("ATP", allowed_ids=np.array([0]))
+    assert ids.tolist() == [0]
+
+    ids, _ = index.search("ATP", excluded_ids=np.array([0]))
+    assert ids.tolist() == [1]
+
+
+def test_search_unknown_terms_returns_nothing():
+    ids, scores = build_index().search("quantum")
+
+    assert len(ids) == 0 and len(scores) == 0
+
+
+# Compaction / persistence
+
+
+def test_compact_drops_and_renumbers_chunks():
+    index = build_index()
+
+    index.compact(np.array([True, False, True, True]))
+
+    assert len(index) == 3
+    ids, _ = index.search("mitochondria")
+    # chunk 3 became chunk 2; chunk 1 is gone
+    assert ids.tolist() == [2]
+
+
+def test_save_load_round_trip(tmp_path):
+    index = build_index()
+    index.add([tokenize("Énergie libre de Gibbs")])
+
+    path = str(tmp_path / "lexical.npz")
+    index.save(path)
+    loaded = BM25Index.load(path)
+
+    assert len(loaded) == len(index)
+    for query in ("mitochondria ATP", "énergie", "krebs cycle"):
+        expected_ids, expected_scores = index.search(query)
+        ids, scores = loaded.search(query)
+
+        assert ids.tolist() == expected_ids.tolist()
+        np.testing.assert_allclose(scores, expected_scores)
+
+
+def test_save_size_does_not_depend_on_longest_term(tmp_path):
+    short = BM25Index()
+    short.add([[f"term{i}" for i in range(1000)]])
+
+    padded = BM25Index()
+    padded.add([[f"term{i}" for i in range(1000)] + ["y" * MAX_TOKEN_LENGTH]])
+
+    short.save(str(tmp_path / "short.npz"))
+    padded.save(str(tmp_path / "padded.npz"))
+
+    grown = (tmp_path / "padded.npz").stat().st_size - (
+        tmp_path / "short.npz"
+    ).stat().st_size
+
+    assert grown < 1024
+
+
+# Rank fusion
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    ids, scores = reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]], top_k=3)
+
+    assert ids.tolist() == [1, 3, 2]
+    assert scores[0] == pytest.approx(1 / 61 + 1 / 62)
+
+
+def test_reciprocal_rank_fusion_empty():
+    ids, scores = reciprocal_rank_fusion([[], []], top_k=4)
+
+    assert len(ids) == 0 and len(scores) == 0
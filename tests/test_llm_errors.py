@@ -0,0 +1,77 @@
+import pytest
+
+httpx = pytest.importorskip("httpx")
+groq = pytest.importorskip("groq")
+
+from services.core.llm_errors import (  # noqa: E402
+    LLMError,
+    LLMQuotaExceededError,
+    LLMRateLimitError,
+    LLMTimeoutError,
+    LLMTransportError,
+    classify_error,
+)
+
+
+def status_error(cls, status: int, message: str, headers=None):
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    response = httpx.Response(status, request=request, headers=headers or {})
+    return cls(message, response=response, body=None)
+
+
+def test_rate_limit_carries_retry_after():
+    error = classify_error(
+        status_error(
+            groq.RateLimitError, 429, "Rate limit reached (RPM)",
+            headers={"retry-after": "7"},
+        )
+    )
+
+    assert isinstance(error, LLMRateLimitError)
+    assert error.retryable
+    assert error.retry_after == 7.0
+
+
+def test_daily_limit_is_not_retryable():
+    error = classify_error(
+        status_error(
+            groq.RateLimitError, 429,
+            "Rate limit reached on tokens per day (TPD)",
+        )
+    )
+
+    assert isinstance(error, LLMQuotaExceededError)
+    assert not error.retryable
+
+
+def test_server_errors_are_transport_errors():
+    error = classify_error(
+        status_error(groq.InternalServerError, 503, "Service unavailable")
+    )
+
+    assert isinstance(error, LLMTransportError)
+    assert error.retryable
+
+
+@pytest.mark.parametrize(
+    "raised, expected",
+    [
+        (httpx.ReadTimeout("timed out"), LLMTimeoutError),
+        (httpx.ConnectError("refused"), LLMTransportError),
+    ],
+)
+def test_httpx_errors(raised, expected):
+    assert type(classify_error(raised)) is expected
+
+
+def test_unknown_errors_are_not_retried():
+    error = classify_error(ValueError("bad request"))
+
+    assert type(error) is LLMError
+    assert not error.retryable
+
+
+def test_llm_errors_pass_through():
+    error = LLMTimeoutError("slow")
+
+    assert classify_error(error) is error
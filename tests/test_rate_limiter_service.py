@@ -0,0 +1,59 @@
+import time
+
+from services.core.rate_limiter_service import RequestScheduler
+
+
+def make_scheduler(tokens_per_minute: int = 60) -> RequestScheduler:
+    # 60 TPM refills one token per second, so waits are easy to see
+    return RequestScheduler(
+        requests_per_minute=600,
+        tokens_per_minute=tokens_per_minute,
+    )
+
+
+def test_acquire_within_budget_does_not_wait():
+    scheduler = make_scheduler()
+
+    assert scheduler.acquire(30) < 0.05
+    assert scheduler.acquire(30) < 0.05
+    assert scheduler.stats()["granted"] == 2
+
+
+def test_settle_refunds_unused_tokens():
+    scheduler = make_scheduler()
+
+    scheduler.acquire(60)
+    scheduler.settle(60, 10)
+
+    # without the refund this would wait ~40 s
+    assert scheduler.acquire(40) < 0.5
+
+
+def test_settle_charges_overuse():
+    scheduler = make_scheduler()
+
+    scheduler.acquire(10)
+    scheduler.settle(10, 60)
+
+    assert scheduler._wait_time(30) > 20
+
+
+def test_pause_holds_callers_back():
+    scheduler = make_scheduler()
+
+    scheduler.pause(0.2)
+
+    start = time.monotonic()
+    scheduler.acquire(1)
+
+    assert time.monotonic() - start >= 0.15
+
+
+def test_estimate_is_capped_at_bucket_capacity():
+    scheduler = make_scheduler()
+
+    # larger than the whole per-minute budget: still admitted
+    assert scheduler.acquire(10_000) < 0.05
+    scheduler.settle(10_000, 0)
+
+    assert scheduler.acquire(60) < 0.5
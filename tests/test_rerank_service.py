@@ -0,0 +1,51 @@
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("langchain")
+
+from langchain.schema import Document  # noqa: E402
+
+from services.core.rerank_service import (  # noqa: E402
+    STUB_RERANK_MODEL,
+    StubCrossEncoder,
+    get_rerank_model,
+    rerank_documents,
+)
+
+
+def test_stub_scores_query_term_overlap():
+    scores = StubCrossEncoder().predict(
+        [
+            ("krebs cycle", "The Krebs cycle runs in mitochondria"),
+            ("krebs cycle", "Glycolysis runs in the cytoplasm"),
+            ("krebs cycle", "The cycle of seasons"),
+        ]
+    )
+
+    assert scores.tolist() == [1.0, 0.0, 0.5]
+
+
+def test_stub_model_is_shared():
+    assert get_rerank_model(STUB_RERANK_MODEL) is get_rerank_model(
+        STUB_RERANK_MODEL
+    )
+
+
+def test_rerank_returns_top_k_best_first():
+    documents = [
+        Document(page_content="Glycolysis splits glucose"),
+        Document(page_content="The Krebs cycle produces NADH"),
+        Document(page_content="Cycle counting in graphs"),
+    ]
+
+    ranked = rerank_documents(
+        "krebs cycle", documents, top_k=2, model_name=STUB_RERANK_MODEL
+    )
+
+    assert [doc for doc, _ in ranked] == [documents[1], documents[2]]
+    assert [score for _, score in ranked] == [1.0, 0.5]
+
+
+def test_rerank_no_documents():
+    assert rerank_documents("anything", [], model_name=STUB_RERANK_MODEL) == []
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from services.ai_text_summarization import summarization_utils
+from services.ai_text_summarization.summarization_utils import (
+    CHARS_PER_TOKEN,
+    group_by_token_budget,
+    reduce_by_token_budget,
+)
+
+
+@pytest.fixture(autouse=True)
+def char_based_tokens(monkeypatch):
+    # deterministic counts whether or not tiktoken is installed
+    monkeypatch.setattr(summarization_utils, "_get_encoding", lambda: None)
+
+
+def text_of(tokens: int) -> str:
+    return "x" * (tokens * CHARS_PER_TOKEN)
+
+
+def reduce(texts, budget):
+    calls = []
+
+    async def merge(group):
+        calls.append(len(group))
+        # a merge is as long as its longest input
+        return max(group, key=len)
+
+    level = asyncio.run(reduce_by_token_budget(texts, merge, budget))
+    return level, calls
+
+
+# group_by_token_budget
+
+
+def test_group_empty():
+    assert group_by_token_budget([], 100) == []
+
+
+def test_group_single():
+    assert group_by_token_budget([text_of(10)], 100) == [[text_of(10)]]
+
+
+def test_group_packs_consecutive_texts_within_budget():
+    texts = [text_of(40), text_of(40), text_of(40), text_of(40)]
+
+    groups = group_by_token_budget(texts, 100)
+
+    assert [len(g) for g in groups] == [2, 2]
+    assert [t for g in groups for t in g] == texts
+
+
+def test_group_oversized_text_gets_own_group():
+    texts = [text_of(10), text_of(500), text_of(10)]
+
+    assert [len(g) for g in group_by_token_budget(texts, 100)] == [1, 1, 1]
+
+
+# reduce_by_token_budget
+
+
+def test_reduce_empty_returns_immediately():
+    assert reduce([], 100) == ([], [])
+
+
+def test_reduce_single_text_is_not_merged():
+    assert reduce([text_of(10)], 100) == ([text_of(10)], [])
+
+
+def test_reduce_fitting_texts_are_left_for_the_final_merge():
+    texts = [text_of(10)] * 5
+
+    assert reduce(texts, 100) == (texts, [])
+
+
+def test_reduce_merges_level_by_level_until_one_prompt_fits():
+    # 20 → 7 → 3 texts of 30 tokens, three per 100-token prompt
+    level, calls = reduce([text_of(30)] * 20, 100)
+
+    assert len(level) == 3
+    assert len(calls) == 7 + 2
+    assert all(size <= 3 for size in calls)
+
+
+def test_reduce_oversized_texts_merge_pairwise_and_terminate():
+    # no two texts fit together in one budget-sized prompt
+    level, calls = reduce([text_of(80)] * 9, 100)
+
+    assert len(level) == 2
+    assert calls and all(size == 2 for size in calls)
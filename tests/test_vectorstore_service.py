@@ -0,0 +1,127 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+faiss = pytest.importorskip("faiss")
+pytest.importorskip("langchain")
+
+from langchain.schema import Document  # noqa: E402
+
+from services.core.index_factory import MappedFlatIndex  # noqa: E402
+from services.core.vectorstore_service import (  # noqa: E402
+    VectorStoreService,
+    maximal_marginal_relevance,
+)
+
+
+DIMENSION = 16
+
+
+def unit_vectors(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, DIMENSION), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def documents(n: int, prefix: str = "chunk"):
+    return [Document(page_content=f"{prefix} {i}") for i in range(n)]
+
+
+# MMR
+
+
+def test_mmr_skips_near_duplicates():
+    near_duplicate = np.array([0.999, 0.0447], dtype=np.float32)
+    candidates = np.stack(
+        [
+            np.array([1.0, 0.0], dtype=np.float32),
+            near_duplicate / np.linalg.norm(near_duplicate),
+            np.array([0.0, 1.0], dtype=np.float32),
+        ]
+    )
+    query_scores = np.array([0.9, 0.89, 0.7], dtype=np.float32)
+
+    assert maximal_marginal_relevance(query_scores, candidates, 2) == [0, 2]
+
+
+def test_mmr_with_lambda_one_is_plain_relevance():
+    candidates = unit_vectors(5)
+    query_scores = np.array([0.1, 0.5, 0.3, 0.9, 0.2], dtype=np.float32)
+
+    selected = maximal_marginal_relevance(
+        query_scores, candidates, 3, lambda_mult=1.0
+    )
+
+    assert selected == [3, 1, 2]
+
+
+# Search / removal
+
+
+def test_search_returns_exact_match_first():
+    vectors = unit_vectors(50)
+    store = VectorStoreService(embedding_dimension=DIMENSION)
+    store.add_documents(vectors, documents(50))
+
+    ids, scores = store.search_ids(vectors[7], top_k=3)
+
+    assert ids[0] == 7
+    assert scores[0] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_removed_document_is_never_returned():
+    vectors = unit_vectors(20)
+    store = VectorStoreService(embedding_dimension=DIMENSION)
+    store.add_documents(vectors[:10], documents(10, "alpha"), doc_id="a")
+    store.add_documents(vectors[10:], documents(10, "beta"), doc_id="b")
+
+    assert store.remove_document("a") == 10
+    assert store.num_chunks == 10
+
+    dense = store.similarity_search_with_scores(vectors[3], top_k=20)
+    assert dense
+    assert all(doc.page_content.startswith("beta") for doc, _ in dense)
+
+    lexical_ids, _ = store.lexical_search_ids("alpha beta", top_k=20)
+    assert len(lexical_ids) == 10
+    assert all(
+        store.documents[i].page_content.startswith("beta")
+        for i in lexical_ids.tolist()
+    )
+
+
+# Persistence
+
+
+def test_saved_flat_store_is_memory_mapped_and_writable(tmp_path):
+    vectors = unit_vectors(30)
+    store = VectorStoreService(embedding_dimension=DIMENSION)
+    store.add_documents(vectors, documents(30), doc_id="doc")
+
+    expected_ids, expected_scores = store.search_ids(vectors[4], top_k=5)
+
+    store.save(str(tmp_path))
+    loaded = VectorStoreService.load(str(tmp_path), mmap=True)
+
+    assert isinstance(loaded.index, MappedFlatIndex)
+
+    ids, scores = loaded.search_ids(vectors[4], top_k=5)
+    assert ids.tolist() == expected_ids.tolist()
+    np.testing.assert_allclose(scores, expected_scores, rtol=1e-5)
+
+    filtered, _ = loaded.search_ids(vectors[4], top_k=5, doc_ids=["doc"])
+    assert filtered.tolist() == expected_ids.tolist()
+
+    # the first modification swaps in an in-memory FAISS index
+    extra = unit_vectors(5, seed=1)
+    loaded.add_documents(extra, documents(5, "extra"))
+
+    assert isinstance(loaded.index, faiss.IndexFlat)
+    assert loaded.search_ids(extra[2], top_k=1)[0].tolist() == [32]
+
+
+def test_versions_differ_between_instances():
+    first = VectorStoreService(embedding_dimension=DIMENSION)
+    second = VectorStoreService(embedding_dimension=DIMENSION)
+
+    assert first.version != second.version